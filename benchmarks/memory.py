@@ -0,0 +1,36 @@
+"""
+This measures how many bytes each term of a big expansion costs,
+using tracemalloc.  We count everything that the result keeps
+alive: the _Term objects, their coefficients, and the interned
+monomial data that they point to.
+
+    python -m benchmarks.memory
+"""
+import tracemalloc
+from polynomial.poly import Poly
+
+
+def expansion(var_names, exponent):
+    total = Poly.one()
+    for var_name in var_names:
+        total = total + Poly.var(var_name)
+    return total**exponent
+
+
+def bytes_per_term(var_names, exponent):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    p = expansion(var_names, exponent)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(p.terms), (after - before) / len(p.terms)
+
+
+for var_names, exponent in [
+    ("xyz", 30),
+    ("xyzw", 20),
+    ("xyzwuv", 10),
+]:
+    num_terms, size = bytes_per_term(var_names, exponent)
+    label = f"({'+'.join(var_names)}+1)**{exponent}"
+    print(f"{label:24} {num_terms:8} terms {size:8.1f} bytes/term")
@@ -0,0 +1,226 @@
+"""
+This times the core Poly operations across all three Math handlers
+and a range of polynomial sizes, so that we can check performance
+changes against a saved baseline.
+
+    python -m benchmarks.suite --output before.json
+    # ...make your changes...
+    python -m benchmarks.suite --baseline before.json
+
+Each benchmark has a name like "multiply/fraction/v3-d8-t60", which
+means we multiplied random FractionMath polynomials in 3 variables,
+with total degree at most 8 and 60 terms.  We report the best
+seconds-per-call over several runs, and we flag any benchmark that
+got slower than the baseline by more than the tolerance (20% by
+default).  The exit status is 1 if anything regressed.
+
+The polynomials come from a seeded random number generator, so
+every run does exactly the same work.  We only use the public API
+that Poly has always had (var, constant, +, *, and so on), so that
+you can run the suite on an older tree to get the "before" numbers.
+Use --quick for a smaller set of sizes, and --filter to run just the
+benchmarks whose names contain some string.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from fractions import Fraction
+from polynomial.fraction_math import FractionMath
+from polynomial.integer_math import IntegerMath
+from polynomial.modulus_math import ModulusMath
+from polynomial.poly import Poly, set_math
+
+RINGS = [
+    ("integer", IntegerMath),
+    ("fraction", FractionMath),
+    ("modulus", ModulusMath(1_000_003)),
+]
+
+VAR_NAMES = ["x", "y", "z", "w", "u", "v"]
+
+# (number of variables, total degree, number of terms)
+QUICK_SIZES = [(1, 20, 10), (2, 8, 20), (3, 6, 40)]
+FULL_SIZES = QUICK_SIZES + [(1, 200, 100), (3, 12, 150), (5, 8, 300)]
+
+
+def coerce(ring_name, Math, n):
+    if ring_name == "fraction":
+        return Fraction(n, 1 + abs(n) % 5)
+    if ring_name == "modulus":
+        return n % Math.modulus
+    return n
+
+
+def random_poly(rng, ring_name, Math, num_vars, degree, num_terms):
+    """
+    We pick random monomials with total degree at most degree until
+    we have num_terms distinct ones (or run out of monomials).  Then
+    we build each term out of Poly.constant and Poly.var.
+    """
+    var_names = VAR_NAMES[:num_vars]
+    coeffs_by_key = {}
+    for _ in range(20 * num_terms):
+        if len(coeffs_by_key) == num_terms:
+            break
+        budget = rng.randint(0, degree)
+        exponents = dict.fromkeys(var_names, 0)
+        for _ in range(budget):
+            exponents[rng.choice(var_names)] += 1
+        key = tuple((v, e) for v, e in sorted(exponents.items()) if e)
+        c = rng.choice([n for n in range(-9, 10) if n != 0])
+        coeffs_by_key[key] = coerce(ring_name, Math, c)
+
+    terms = []
+    for key, c in coeffs_by_key.items():
+        term = Poly.constant(c)
+        for var_name, exponent in key:
+            term = term * Poly.var(var_name) ** exponent
+        terms.append(term)
+    return Poly.sum(terms)
+
+
+def workloads(rng, ring_name, Math, num_vars, degree, num_terms):
+    """
+    This builds the inputs up front and returns (op_name, f) pairs,
+    where f does the actual work that we time.
+    """
+
+    def make(num_terms, degree=degree):
+        return random_poly(rng, ring_name, Math, num_vars, degree, num_terms)
+
+    p = make(num_terms)
+    q = make(num_terms)
+    small = make(max(2, num_terms // 8), max(1, degree // 3))
+    replacement = make(3, 2)
+    summands = [make(num_terms) for _ in range(20)]
+    values = {
+        var_name: coerce(ring_name, Math, i + 2)
+        for i, var_name in enumerate(VAR_NAMES[:num_vars])
+    }
+    first_var = VAR_NAMES[0]
+
+    def canonicalized_string():
+        """
+        A Poly may cache its string, so we make a fresh copy each
+        time, which means that the time includes the copying.
+        """
+        return p.transform_coefficients(lambda c: c).canonicalized_string()
+
+    return [
+        ("multiply", lambda: Poly.multiply_polys(p, q)),
+        ("power", lambda: small.raised_to_exponent(4)),
+        ("substitute", lambda: p.substitute(first_var, replacement)),
+        ("eval", lambda: p.eval(**values)),
+        ("eval_small", lambda: small.eval(**values)),
+        ("apply", lambda: p.apply(**{first_var: values[first_var]})),
+        ("sum", lambda: Poly.sum(summands)),
+        ("canonicalized_string", canonicalized_string),
+    ]
+
+
+def best_time_per_call(f, repeat, min_time):
+    """
+    We first find a number of calls that takes at least min_time,
+    so that the timer resolution doesn't matter, and then we report
+    the best of repeat runs of that many calls.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            f()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            f()
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def run(sizes, name_filter, repeat, min_time):
+    results = {}
+    for ring_name, Math in RINGS:
+        set_math(Math)
+        try:
+            for num_vars, degree, num_terms in sizes:
+                rng = random.Random(f"{ring_name}-{num_vars}-{degree}-{num_terms}")
+                size = f"v{num_vars}-d{degree}-t{num_terms}"
+                for op_name, f in workloads(
+                    rng, ring_name, Math, num_vars, degree, num_terms
+                ):
+                    name = f"{op_name}/{ring_name}/{size}"
+                    if name_filter and name_filter not in name:
+                        continue
+                    results[name] = best_time_per_call(f, repeat, min_time)
+                    print(f"{name:45} {results[name] * 1000:12.3f} ms", file=sys.stderr)
+        finally:
+            set_math(IntegerMath)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    This prints a line for every benchmark that we have in common
+    with the baseline, and it returns the names of the ones that
+    got slower by more than the tolerance.
+    """
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        ratio = results[name] / baseline[name]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            flag = "  faster"
+        print(f"{name:45} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Poly operations.")
+    parser.add_argument("--quick", action="store_true", help="use fewer sizes")
+    parser.add_argument("--filter", default="", help="only run matching names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    results = run(sizes, args.filter, args.repeat, args.min_time)
+    report = dict(
+        python=platform.python_version(),
+        platform=platform.platform(),
+        results=results,
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
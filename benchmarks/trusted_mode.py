@@ -0,0 +1,79 @@
+"""
+This compares the normal (checked) mode of Poly against trusted
+mode on the operations that build the most terms and polynomials.
+
+    python -m benchmarks.trusted_mode
+
+Trusted mode skips the checks that we do when we build terms and
+polynomials.  Each check is cheap, so they only add up when you do
+lots of operations on small polynomials, and that is what these
+workloads do.  (Big products spend almost all of their time adding
+up coefficients in a dict, which we never check, so trusted mode
+makes little difference there.)
+
+The difference is around five to fifteen percent, which is easy to
+lose in the noise, so we measure CPU time (rather than wall-clock
+time, which other processes can throw off), alternate between the
+two modes, and keep the best time for each.
+"""
+import time
+from polynomial.poly import Poly, set_trusted_mode
+
+x = Poly.var("x")
+y = Poly.var("y")
+z = Poly.var("z")
+u = Poly.var("u")
+SMALL_POLYS = [((x + i * y + 1) * (z - i), (x - y + i) * (u + i)) for i in range(1, 30)]
+
+
+def small_ops_workload():
+    p = 3 * x + 2 * y + 1
+    q = x * y - 4
+    for _ in range(5000):
+        result = (p + q, p * 2, p - q)
+    return result
+
+
+def multiply_workload():
+    for _ in range(50):
+        result = [p * q for p, q in SMALL_POLYS]
+    return result
+
+
+def substitute_workload():
+    for _ in range(50):
+        result = [p.substitute("x", q) for p, q in SMALL_POLYS]
+    return result
+
+
+def best_times(f, repeat=11):
+    """
+    This returns the best checked time, the best trusted time, and
+    the results from each mode.
+    """
+    best = {}
+    results = {}
+    for _ in range(repeat):
+        for trusted in [False, True]:
+            set_trusted_mode(trusted)
+            try:
+                start = time.process_time()
+                results[trusted] = f()
+                elapsed = time.process_time() - start
+            finally:
+                set_trusted_mode(False)
+            best[trusted] = min(elapsed, best.get(trusted, elapsed))
+    return best[False], best[True], results
+
+
+for name, workload in [
+    ("small ops", small_ops_workload),
+    ("multiply", multiply_workload),
+    ("substitute", substitute_workload),
+]:
+    checked_time, trusted_time, results = best_times(workload)
+    assert results[False] == results[True]
+    print(
+        f"{name:12} checked {checked_time:.3f}s  trusted {trusted_time:.3f}s"
+        f"  speedup {checked_time / trusted_time:.2f}x"
+    )
@@ -0,0 +1,84 @@
+from polynomial.poly import Poly, using_math
+from polynomial.crt import (
+    crt_multiply,
+    crt_power,
+    crt_substitute,
+    power_bound,
+    primes_for_bound,
+)
+from polynomial.modulus_math import ModulusMath
+
+
+def assert_equal(m, n):
+    if m != n:
+        raise AssertionError(f"{m} != {n}")
+
+
+x = Poly.var("x")
+y = Poly.var("y")
+z = Poly.var("z")
+
+q = (2 * x - 3 * y + 5) ** 3
+big = 10**40 * x - 7 * y + 10**30 * z
+
+
+def check_exact_answers():
+    # We get exactly the same answers as the integer code, including
+    # negative coefficients.
+    p = crt_power(q, 12)
+    assert_equal(p, q**12)
+    assert min(term.coeff for term in p.terms) < 0
+
+    assert_equal(crt_multiply(q, big), q * big)
+    assert_equal(crt_multiply(big, big), big * big)
+    assert_equal(crt_multiply(q, Poly.zero()), Poly.zero())
+
+    r = x**3 * y - 4 * x * z + 9
+    assert_equal(crt_substitute(r, "x", x + y**2), r.substitute("x", x + y**2))
+    assert_equal(crt_substitute(r, "y", big), r.substitute("y", big))
+
+    # Binomials take the "multiply by the base over and over" path.
+    assert_equal(crt_power(3 * x + 1, 50), (3 * x + 1) ** 50)
+    assert_equal(crt_power(3 * x + 1, 0), Poly.one())
+
+
+def check_primes():
+    # We pick just enough primes for the coefficient bound.
+    p = q**12
+    bound = power_bound(q, 12)
+    primes = primes_for_bound(bound)
+    M = 1
+    for prime in primes:
+        M *= prime
+    assert M > 2 * bound >= 2 * max(abs(term.coeff) for term in p.terms)
+    assert M // primes[-1] <= 2 * bound
+
+    # Reducing the answer mod one of the primes is the same as doing
+    # the work with ModulusMath.
+    ring = ModulusMath(primes[0])
+    assert_equal(p.to_ring(ring), q.to_ring(ring) ** 12)
+
+
+def check_rings():
+    # We only work with integer polynomials.
+    with using_math(ModulusMath(7)):
+        m = Poly.var("x")
+    try:
+        crt_multiply(m, m)
+        raise AssertionError("we should only accept integer polynomials")
+    except ValueError:
+        pass
+
+
+def check_workers():
+    assert_equal(crt_power(q, 12, workers=2), q**12)
+    assert_equal(crt_multiply(q, big, workers=3), q * big)
+
+
+# The worker processes need to be able to import this module
+# without re-running the checks.
+if __name__ == "__main__":
+    check_exact_answers()
+    check_primes()
+    check_rings()
+    check_workers()
@@ -0,0 +1,63 @@
+from polynomial.poly import Poly, set_math
+from polynomial.dense import DensePoly, choose_method
+from polynomial.integer_math import IntegerMath
+from polynomial.modulus_math import ModulusMath
+
+
+def assert_equal(m, n):
+    if m != n:
+        raise AssertionError(f"{m} != {n}")
+
+
+x = Poly.var("x")
+
+# DensePoly converts both ways with Poly.
+p = (3 * x + 1) ** 4
+dense_p = DensePoly.from_poly(p)
+assert_equal(dense_p.coeffs, [1, 12, 54, 108, 81])
+assert_equal(dense_p.coeffs, p.numpy_vector())
+assert_equal(dense_p.to_poly(), p)
+assert_equal(str(dense_p), str(p))
+
+# All the multiplication methods agree with Poly.
+q = (x - 2) ** 40 + 7 * x**3
+dense_q = DensePoly.from_poly(q)
+for method in ["schoolbook", "karatsuba", "kronecker"]:
+    assert_equal(dense_p.multiply(dense_q, method).to_poly(), p * q)
+assert_equal((dense_q**5).to_poly(), q**5)
+assert_equal(dense_q.eval(3), q.eval(x=3))
+
+# Big products are fast, since they never touch _Term objects.
+big = DensePoly("x", [(i * 7919) % 1000 - 500 for i in range(20000)])
+product = big * big
+assert_equal(product.degree(), 2 * big.degree())
+assert_equal(product.eval(2), big.eval(2) ** 2)
+
+# For ModulusMath over an NTT-friendly prime we can use the
+# number-theoretic transform.
+PRIME = 998244353
+set_math(ModulusMath(PRIME))
+x = Poly.var("x")
+p = (5 * x + 3) ** 20
+q = (x + 1) ** 70
+dense_p = DensePoly.from_poly(p)
+dense_q = DensePoly.from_poly(q)
+for method in ["schoolbook", "karatsuba", "kronecker", "ntt"]:
+    assert_equal(dense_p.multiply(dense_q, method).to_poly(), p * q)
+assert_equal(choose_method(100, 100), "ntt")
+set_math(ModulusMath(PRIME + 1))
+assert_equal(choose_method(100, 100), "kronecker")
+set_math(IntegerMath)
+
+# Each DensePoly remembers its ring, so dense_p still does its
+# arithmetic mod PRIME after we switch back to IntegerMath.
+assert_equal((dense_p * dense_q).to_poly(), p * q)
+assert_equal((dense_p - dense_p).coeffs, [])
+assert_equal(dense_p.eval(PRIME - 1), p.eval(x=PRIME - 1))
+
+# But we don't mix rings.
+try:
+    dense_p + DensePoly.from_poly(Poly.var("x"))
+    raise AssertionError("we should not add polynomials from different rings")
+except ValueError:
+    pass
@@ -40,3 +40,10 @@ assert_str(p, "(x**2)+(-1/4)")
 
 q = x**2 - Fraction(1, 4)
 assert_equal(p, q)
+
+# FractionMath adds up lists of fractions over a common denominator,
+# which eval uses to add up the values of the terms.
+halves = [Fraction(1, 2), Fraction(1, 3), Fraction(1, 6)]
+assert_equal(FractionMath.sum_many(halves), Fraction(1))
+assert_equal(FractionMath.mul_many(halves), Fraction(1, 36))
+assert_equal(FractionMath.dot(halves, halves), Fraction(7, 18))
@@ -0,0 +1,70 @@
+from fractions import Fraction
+from polynomial.poly import Poly, set_math
+from polynomial.fraction_free import FractionFreePoly
+from polynomial.fraction_math import FractionMath
+from polynomial.integer_math import IntegerMath
+
+
+def assert_equal(m, n):
+    if m != n:
+        raise AssertionError(f"{m} != {n}")
+
+
+set_math(FractionMath)
+
+x = Poly.var("x")
+y = Poly.var("y")
+z = Poly.var("z")
+a = Fraction(1, 3)
+b = Fraction(2, 7)
+c = Fraction(11, 4)
+
+# A FractionFreePoly is a Fraction times an integer polynomial.
+p = (x + a) * (y - b)
+fp = FractionFreePoly.from_poly(p)
+assert_equal(fp.scale, Fraction(1, 21))
+assert_equal(str(fp.poly), "21*x*y+(-6)*x+7*y+(-2)")
+assert_equal(fp.poly.ring, IntegerMath)
+assert_equal(str(fp), str(p))
+assert_equal(fp.to_poly(), p)
+
+# We get exactly the same strings and values as FractionMath.
+q = c * (z**3) - b * x * y + a
+fq = FractionFreePoly.from_poly(q)
+values = dict(x=Fraction(2, 3), y=Fraction(-5, 7), z=Fraction(1, 4))
+for f, g in [
+    (fp + fq, p + q),
+    (fp - fq, p - q),
+    (fp * fq, p * q),
+    (fq**5, q**5),
+    ((fp + fq) ** 3 * fq, (p + q) ** 3 * q),
+    (fp * c + 1, p * c + Fraction(1)),
+    (fp.substitute("x", fq), p.substitute("x", q)),
+]:
+    assert_equal(str(f), str(g))
+    assert_equal(f.eval(**values), g.eval(**values))
+
+# The content and primitive part are unique, so we can compare
+# polynomials that we built in different ways.
+assert_equal((fp + fq) * (fp - fq), fp * fp - fq * fq)
+# (The leading coefficient of the primitive part is positive, so
+# the sign goes into the content.)
+assert_equal(fq.content(), Fraction(-1, 84))
+assert_equal(str(fq.primitive_part()), "24*x*y+(-231)*(z**3)+(-28)")
+assert_equal(fq.content() * FractionFreePoly.from_poly(fq.primitive_part()), fq)
+sum_with_content = fq * 6 + fq * 6
+assert_equal(sum_with_content.known_content, None)
+assert_equal(sum_with_content.normalized().known_content, 1)
+assert_equal(sum_with_content.content(), 12 * fq.content())
+
+# Zero and constants behave.
+assert (fp - fp).is_zero()
+assert_equal(fp * 0, FractionFreePoly.from_poly(Poly.zero()))
+assert_equal(str(fp.substitute("x", fp - fp)), str(p.substitute("x", Poly.zero())))
+
+# We always do our integer arithmetic with IntegerMath, so this
+# works no matter which Math type is in effect.
+set_math(IntegerMath)
+fx = FractionFreePoly.var("x")
+assert_equal(str(fx * a + b), "1/3*x+2/7")
+assert_equal(str((fx * a + b) ** 2), str((x * a + b) ** 2))
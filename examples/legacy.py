@@ -1,4 +1,4 @@
-from polynomial.poly import Poly
+from polynomial.poly import Poly, set_substitution_cache_size
 
 """
 These are very raw tests that I built up while developing the 
@@ -120,3 +120,11 @@ assert Poly.multiply_polys(zero, p) == zero
 assert Poly.multiply_polys(p, zero) == zero
 assert Poly.multiply_polys(one, p) == p
 assert Poly.multiply_polys(p, one) == p
+
+# Substitution computes each power of the new polynomial only once,
+# and it can optionally remember recent results.
+p = (x**3 + 2 * x**2 * y + x * z + 7).substitute("x", y - z + 1)
+assert p == (y - z + 1) ** 3 + 2 * (y - z + 1) ** 2 * y + (y - z + 1) * z + 7
+set_substitution_cache_size(4)
+assert p.substitute("y", z**2) is p.substitute("y", z**2)
+set_substitution_cache_size(0)
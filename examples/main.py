@@ -1,4 +1,4 @@
-from polynomial.poly import Poly
+from polynomial.poly import Poly, profile
 
 
 def assert_str(p, s):
@@ -36,6 +36,16 @@ assert_str(
     "(x**6)+6*(x**5)*y+15*(x**4)*(y**2)+20*(x**3)*(y**3)+15*(x**2)*(y**4)+6*x*(y**5)+(y**6)",
 )
 
+# Large exponents are fine too.
+assert_equal(len(((x + y + z) ** 200).terms), 20301)
+assert_equal(((x + 1) ** 1000).eval(x=1), 2**1000)
+assert_equal((x + y - 1) ** 7, (x + y - 1) * (x + y - 1) ** 6)
+
+# Polynomials with lots of terms work too (we just multiply them).
+wide = Poly.sum([Poly.var(f"v{i}") for i in range(100)])
+assert_equal(len((wide**2).terms), 5050)
+assert_equal(wide.multinomial_expansion(2), wide * wide)
+
 # You can evaluate polynomials.
 h = Poly.var("height")
 w = Poly.var("width")
@@ -109,6 +119,18 @@ assert p * q == q * p
 assert 2 * p + q == p + p + q
 assert (p + 3) ** 2 == p**2 + 6 * p + 9
 
+# Poly objects are immutable, so you can use them as dict keys or
+# set members.
+assert_equal(len({p + q, q + p, p * q, q * p, p}), 3)
+names = {x + 1: "successor", x * x: "square"}
+assert_equal(names[(x + 1) ** 2 - x - x**2], "successor")
+
+# Other keys can sit next to them, even if their hashes collide.
+keys = {x + 1: "poly", hash(x + 1): "int"}
+assert_equal(keys[x + 1], "poly")
+assert_equal(keys[hash(x + 1)], "int")
+assert x + 1 != "x + 1"
+
 # You can do partial application of variable assignments on polynomials.
 assert (x + y**2).apply(y=2) == x + 4
 assert (x + y**2 + z).apply(y=3) == x + 9 + z
@@ -150,12 +172,17 @@ assert_equal(q, (2 * u + 7) * (2 * y + 1) * z)
 assert_str(q, "4*u*y*z+2*u*z+14*y*z+7*z")
 assert_equal(q.variables(), {"u", "y", "z"})
 
+# You can substitute several variables at once.  The substitutions
+# happen simultaneously, so you can even swap variables.
+q = p.substitute_many({"x": u + 3, "y": u - 1})
+assert_equal(q, (2 * u + 7) * (2 * u - 1) * z)
+assert_equal((x**2 + 3 * y).substitute_many({"x": y, "y": x}), y**2 + 3 * x)
+
 # If you have a large polynomial that you will need to evaluate
 # many times, then you can take advantage of the fact that the
 # polynomial strings are valid Python, and you can have Python
-# compile the expression on the fly.  For safety reasons I do not
-# provide a convenient way to do that from Poly itself, but the
-# pattern is pretty easy and provided below.
+# compile the expression on the fly.  The pattern is pretty easy
+# and provided below.
 p = (x + 5) * (y - 2) ** 3 + x**3 - y**4
 assert_str(
     p,
@@ -174,3 +201,66 @@ horner = 1 + x * (2 + x * (3 + x * (4 + x * (5 + 6 * x))))
 assert_str(horner, "6*(x**5)+5*(x**4)+4*(x**3)+3*(x**2)+2*x+1")
 # ^^^^ And then horner.eval() actually computes x**5, x**4, x**3,
 #      and x**2 independently.
+
+# If you need to evaluate a polynomial many times, use compile(),
+# which does all its checking up front and computes each power of
+# each variable just once per call.  With codegen=True, it generates
+# straight-line Python code (from coefficients, not strings).
+horner_f = horner.compile()
+horner_g = horner.compile(codegen=True)
+p_f = p.compile(codegen=True)
+for i in range(-20, 20):
+    assert_equal(horner_f(x=i), horner.eval(x=i))
+    assert_equal(horner_g(x=i), horner.eval(x=i))
+    assert_equal(p_f(x=i, y=3 * i), p.eval(x=i, y=3 * i))
+
+# If you are building a big polynomial from a long chain of
+# operations, you can opt into lazy mode, which defers all the
+# simplification until you actually look at the result.
+lazy_x = x.lazy()
+lazy_y = y.lazy()
+e = (lazy_x + lazy_y) ** 5 - (lazy_x - lazy_y) ** 5
+assert (lazy_x + lazy_y) is (lazy_y + lazy_x)
+assert_equal(e.eval(x=3, y=2), 5**5 - 1)
+assert_str(e, "10*(x**4)*y+20*(x**2)*(y**3)+2*(y**5)")
+assert e == (x + y) ** 5 - (x - y) ** 5
+assert (x + y) ** 5 - (x - y) ** 5 == e
+
+# Adding to a long lazy sum doesn't copy it, and we add everything
+# up at once when we expand it.
+total = Poly.zero().lazy()
+for i in range(1, 5001):
+    total = total + lazy_x * i
+assert_str(total, "12502500*x")
+
+# Poly.parse reads the canonical string format back in.
+assert_equal(Poly.parse(str(p)), p)
+assert_equal(Poly.parse("y*x+3*(x**2)+x*y"), 3 * x**2 + 2 * x * y)
+
+# You can stream the terms of a big product or power in canonical
+# order, without holding the whole result in memory.
+big = (x + y + 1) ** 30
+terms = Poly.iter_expand_power(x + y + 1, 30)
+assert_equal([t.canonicalized_string() for t in terms], str(big).split("+"))
+products = Poly.iter_product(x + y, x - y)
+assert_equal([t.canonicalized_string() for t in products], ["(x**2)", "(-1)*(y**2)"])
+
+# profile() counts what goes on inside a computation.
+with profile() as stats:
+    (x + y) * (x - y)
+assert_equal(stats.counts["Math.mul"], 4)
+assert_equal(stats.poly_sizes[2], 3)  # x+y, x-y, and (x**2)+(-1)*(y**2)
+assert_equal(stats.as_dict()["bucket_sizes"], {})
+
+# Most terms get built from interned monomials, and the first run
+# is the only one that has to build those monomials.
+z = Poly.var("z")
+a = (x + y + z + 1) ** 3
+b = (x + y + z + 1) ** 9
+for _ in range(2):
+    with profile() as stats:
+        product = a * b
+    assert_equal(len(product.terms), 455)
+    assert_equal(stats.counts["_Term.with_coeff"], 455)
+    assert_equal(stats.counts["_Term.from_key"], 455)
+assert_equal(stats.counts["_Term.__init__"], 0)
@@ -1,5 +1,4 @@
 # Show that modular arithmetic over polynomials behaves correctly.
-# This is slightly hacky for now.
 from polynomial.poly import Poly, set_math
 from polynomial.integer_math import IntegerMath
 from polynomial.modulus_math import ModulusMath
@@ -41,6 +40,13 @@ transformed_p = p.transform_coefficients(mod)
 transformed_p_str = "9*(x**3)*z+7*(x**3)+(x**2)+2*x+2*(y**20)+8*(z**6)+1"
 assert_equal(str(transformed_p), transformed_p_str)
 
+# Each Poly remembers its ring, so we can convert p to arithmetic
+# mod MODULUS once, up front, and then use both polynomials side by
+# side without ever calling set_math.
+q = p.to_ring(ModulusMath(MODULUS))
+assert_equal(str(q), transformed_p_str)
+assert_equal(q, complicated_polynomial().to_ring(ModulusMath(MODULUS)))
+
 small_results = set()
 
 # Show that p and q behave the same across their respective domains.
@@ -48,14 +54,9 @@ for x in range(MODULUS * 2):
     for y in range(MODULUS * 2):
         for z in range(MODULUS * 2):
             # Do a normal integer computation of the p polynomial.
-            set_math(IntegerMath)
-            p = complicated_polynomial()
             big_result = p.eval(x=x, y=y, z=z)
 
             # Compute the q polynomial with modular arithmetic.
-            set_math(ModulusMath(MODULUS))
-            q = complicated_polynomial()
-            assert_equal(str(q), transformed_p_str)
             small_result = q.eval(x=mod(x), y=mod(y), z=mod(z))
 
             # assert we are doing something non-trivial here
@@ -69,3 +70,40 @@ for x in range(MODULUS * 2):
 
 # Make sure we found a bunch of interesting results.
 assert set(small_results) == set(range(MODULUS))
+
+# Large exponents are cheap, and for a prime modulus every non-zero
+# value has an inverse (and Fermat's little theorem holds).
+PRIME = 13
+prime_math = ModulusMath(PRIME)
+set_math(prime_math)
+x = Poly.var("x")
+for n in range(PRIME):
+    assert_equal((x**1000).eval(x=n), pow(n, 1000, PRIME))
+    assert_equal((x**PRIME - x).eval(x=n), 0)
+    if n != 0:
+        assert_equal(prime_math.mul(n, prime_math.inverse(n)), 1)
+set_math(IntegerMath)
+
+# Polynomials from different rings don't mix.
+try:
+    p + q
+    raise AssertionError("we should not add polynomials from different rings")
+except ValueError:
+    pass
+
+# But we can still compare them (they are never equal), and keep
+# them together in a set.
+x_mod = Poly.var("x").to_ring(ModulusMath(MODULUS))
+assert Poly.var("x") != x_mod
+assert_equal(len({Poly.var("x"), x_mod}), 2)
+
+# Lazy polynomials also do their arithmetic in the ring of their
+# leaves.
+lazy_q = q.lazy()
+assert_equal((lazy_q * 3 + 1).eval(x=1, y=2, z=3), (q * 3 + 1).eval(x=1, y=2, z=3))
+assert_equal(lazy_q.eval(x=1, y=2, z=3), q.eval(x=1, y=2, z=3))
+try:
+    lazy_q + p.lazy()
+    raise AssertionError("we should not add polynomials from different rings")
+except ValueError:
+    pass
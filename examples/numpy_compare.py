@@ -47,3 +47,37 @@ assert (10**30) == 1000000000000000000000000000000
 
 # numpy has a bit of an error
 assert_equal(numpy_eval(p, 10), 999999999999999879147136483328)
+
+"""
+If you want to evaluate a polynomial at many points, use eval_many,
+which does the whole batch with NumPy array operations.  It never
+uses floats, and it falls back to exact Python integers when the
+values could overflow 64 bits.
+"""
+import numpy
+
+y = Poly.var("y")
+q = (x + 1) * (x - 2) * (y + 3) + (y - 5) ** 2
+xs, ys = numpy.meshgrid(numpy.arange(-20, 20), numpy.arange(-20, 20))
+results = q.eval_many(x=xs.ravel(), y=ys.ravel())
+assert_equal(results.dtype, numpy.int64)
+for i, j, result in zip(xs.ravel(), ys.ravel(), results):
+    assert_equal(q.eval(x=int(i), y=int(j)), result)
+
+results = p.eval_many(x=numpy.array([10, 11]))
+assert_equal(results.dtype, object)
+assert_equal(list(results), [10**30, 11**30])
+
+# Other Math types get the values checked just like eval does, so
+# integer arrays work for ModulusMath, but not for FractionMath.
+from polynomial.fraction_math import FractionMath
+from polynomial.modulus_math import ModulusMath
+
+q7 = q.to_ring(ModulusMath(7))
+results = q7.eval_many(x=numpy.array([1, 2, 3]), y=numpy.array([4, 5, 6]))
+assert_equal(list(results), [q7.eval(x=i, y=i + 3) for i in [1, 2, 3]])
+try:
+    q.to_ring(FractionMath).eval_many(x=numpy.array([1]), y=numpy.array([2]))
+    raise AssertionError("we should not accept integers for FractionMath")
+except TypeError:
+    pass
@@ -0,0 +1,37 @@
+from fractions import Fraction
+from polynomial.poly import Poly, set_math
+from polynomial.parallel import parallel_multiply
+from polynomial.fraction_math import FractionMath
+from polynomial.integer_math import IntegerMath
+from polynomial.modulus_math import ModulusMath
+
+
+def assert_equal(m, n):
+    if m != n:
+        raise AssertionError(f"{m} != {n}")
+
+
+def check_parallel_multiply(one, c):
+    x = Poly.var("x")
+    y = Poly.var("y")
+    z = Poly.var("z")
+    p = (x + c * y + z + one) ** 5
+    q = (x * y + c * z + one) ** 4
+
+    # Small products stay serial, unless we lower the threshold.
+    assert_equal(parallel_multiply(p, q), p * q)
+    assert_equal(parallel_multiply(p, q, workers=2, threshold=0), p * q)
+
+
+# The worker processes need to be able to import this module
+# without re-running the checks.
+if __name__ == "__main__":
+    check_parallel_multiply(1, 3)
+
+    set_math(FractionMath)
+    check_parallel_multiply(Fraction(1), Fraction(2, 3))
+
+    set_math(ModulusMath(11))
+    check_parallel_multiply(1, 7)
+
+    set_math(IntegerMath)
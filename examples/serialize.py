@@ -0,0 +1,66 @@
+import os
+import tempfile
+from fractions import Fraction
+from polynomial.poly import Poly, set_math
+from polynomial.fraction_math import FractionMath
+from polynomial.integer_math import IntegerMath
+from polynomial.modulus_math import ModulusMath
+from polynomial.serialize import PolyFile, dump, dumps, load, loads
+
+
+def assert_equal(m, n):
+    if m != n:
+        raise AssertionError(f"{m} != {n}")
+
+
+x = Poly.var("x")
+y = Poly.var("y")
+z = Poly.var("z")
+
+# Round trips preserve the polynomial exactly, including big and
+# negative coefficients.
+p = (x - 2 * y + 3 * z - 1) ** 8 + (10**30) * x * y - 5
+assert_equal(loads(dumps(p)), p)
+assert_equal(loads(dumps(Poly.zero())), Poly.zero())
+assert_equal(loads(dumps(Poly.constant(-7))), Poly.constant(-7))
+
+# PolyFile memory-maps the file, and it can evaluate or scan terms
+# without building a Poly.
+path = os.path.join(tempfile.mkdtemp(), "p.poly")
+with open(path, "wb") as f:
+    dump(p, f)
+with PolyFile(path) as pf:
+    assert_equal(pf.var_names, ["x", "y", "z"])
+    assert_equal(pf.num_terms, len(p.terms))
+    assert_equal(pf.eval(x=3, y=-4, z=5), p.eval(x=3, y=-4, z=5))
+    assert_equal(pf.to_poly(), p)
+    exponents, coeff = next(pf.iter_terms())
+    assert_equal(exponents, (8, 0, 0))
+    assert_equal(coeff, 1)
+with open(path, "rb") as f:
+    assert_equal(load(f), p)
+os.remove(path)
+
+# Fractions store a numerator and a denominator.
+set_math(FractionMath)
+x = Poly.var("x")
+y = Poly.var("y")
+q = (Fraction(1, 3) * x - Fraction(-5, 7) * y) ** 5
+assert_equal(loads(dumps(q)), q)
+
+# The header records the ring, so we load the polynomial back into
+# the same ring, whatever set_math says.
+data = dumps(q)
+set_math(IntegerMath)
+assert_equal(loads(data), q)
+
+# ModulusMath also stores its modulus.
+set_math(ModulusMath(1_000_003))
+x = Poly.var("x")
+r = (x + 5) ** 50
+data = dumps(r)
+assert_equal(loads(data), r)
+set_math(ModulusMath(7))
+assert_equal(loads(data).ring, ModulusMath(1_000_003))
+
+set_math(IntegerMath)
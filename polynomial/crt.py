@@ -0,0 +1,383 @@
+import operator
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+from . import integer_math, modulus_math, poly
+from .poly import Poly, enforce_type
+
+"""
+Integer expansions such as (x + 3*y + 5*z)**100 have coefficients
+with dozens of digits, so every IntegerMath.mul is a bigint
+operation.  This module does the same work modulo many small primes
+at once, and then rebuilds the exact integer answer with the Chinese
+remainder theorem.
+
+    q = (2*x + 3*y + 5) ** 3
+    p = crt_power(q, 12)
+    assert p == q**12
+
+The arithmetic mod each prime is the same as ModulusMath(prime), but
+we don't go through Poly for it.  Like Poly.iter_product, we write
+each monomial as a single integer, with one "digit" per variable, in
+a radix that is big enough that multiplying monomials never carries.
+A polynomial is then a list of those integers (keys) plus a numpy
+array with one row per prime and one column per key.  We work out
+which columns of the product each pair of terms lands in just once,
+and then numpy does the arithmetic for all of the primes together.
+
+The primes are independent of each other, so you can pass workers=4
+to split them among separate processes.
+
+We need enough primes that their product M is more than twice the
+biggest coefficient of the answer, since we map each remainder into
+the symmetric range -M/2 < c <= M/2.  We don't know the answer ahead
+of time, so we use a cheap upper bound on its coefficients instead
+(see multiply_bound, power_bound, and substitute_bound).  Those use
+the "1-norm" of a polynomial, which is the sum of the absolute
+values of its coefficients.  The 1-norm of a product is at most the
+product of the 1-norms, and no coefficient is bigger than the
+1-norm.
+
+This only pays off when the coefficients are big.  Turning them into
+residues and back costs time in proportion to the number of primes,
+which grows with the size of the coefficients, and Python's bigint
+multiplication is already quite fast for small sizes.  Also, Poly
+has smarter ways to raise a polynomial with just a few terms to a
+power (see Poly.multinomial_expansion), and crt_power just hands
+those cases to Poly.
+
+All of the inputs must be integer polynomials (see Poly.ring), and
+the result is an integer polynomial.  This module requires numpy.
+"""
+
+PRIME_LIMIT = 2**26
+
+"""
+Our primes are less than PRIME_LIMIT, so the product of two
+residues is less than 2**52, and we can add up REDUCE_EVERY of those
+products in an int64 before we need to reduce.  We find the primes
+on demand, counting down from PRIME_LIMIT, and we remember them.
+"""
+REDUCE_EVERY = 1024
+_primes = []
+
+
+def chinese_remainder(residues, primes):
+    """
+    The residues array has one row per prime and one column per
+    coefficient.  We return a list of the coefficients, in the
+    symmetric range.
+
+    We precompute the weight for each prime, which is 1 mod that
+    prime and 0 mod all the others, so that each coefficient is
+    just a dot product of its residues with the weights.
+    """
+    M = 1
+    for prime in primes:
+        M *= prime
+    weights = []
+    for prime in primes:
+        cofactor = M // prime
+        weights.append(cofactor * pow(cofactor, -1, prime))
+
+    half = M // 2
+    result = []
+    for column in residues.T.tolist():
+        c = sum(map(operator.mul, column, weights)) % M
+        if c > half:
+            c -= M
+        result.append(c)
+    return result
+
+
+def crt_multiply(poly1, poly2, workers=1):
+    enforce_type(poly1, Poly)
+    enforce_type(poly2, Poly)
+    degrees = [
+        (var_name, degree(poly1, var_name) + degree(poly2, var_name))
+        for var_name in poly1.variables() | poly2.variables()
+    ]
+    bound = multiply_bound(poly1, poly2)
+    return run_multimodular("multiply", [poly1, poly2], [], degrees, bound, workers)
+
+
+def crt_power(p, exponent, workers=1):
+    """
+    When Poly would use the multinomial expansion, we just let Poly
+    do the work.  It builds each term of the answer directly, which
+    beats squaring the residues, and it beats multiplying by p over
+    and over by far (that took 22 seconds for (3*x + 1)**2000).
+    """
+    enforce_type(p, Poly)
+    enforce_type(exponent, int)
+    if exponent < 0:
+        raise ValueError("we do not support negative exponents")
+    enforce_integers([p])
+    if (
+        exponent > 1
+        and len(p.terms) > 1
+        and p.prefers_multinomial_expansion(exponent)
+    ):
+        return p.raised_to_exponent(exponent)
+    degrees = [
+        (var_name, degree(p, var_name) * exponent) for var_name in p.variables()
+    ]
+    bound = power_bound(p, exponent)
+    return run_multimodular("power", [p], [exponent], degrees, bound, workers)
+
+
+def crt_substitute(p, var_name, var_poly, workers=1):
+    """
+    The substituted variable may show up in var_poly too, so we
+    make room for the biggest degree that any variable can reach.
+    """
+    enforce_type(p, Poly)
+    enforce_type(var_name, str)
+    enforce_type(var_poly, Poly)
+    if var_name not in p.variables():
+        raise ValueError("Unknown variable")
+    n = degree(p, var_name)
+    degrees = [
+        (v, max(degree(p, v), n) + n * degree(var_poly, v))
+        for v in p.variables() | var_poly.variables()
+    ]
+    bound = substitute_bound(p, var_name, var_poly)
+    return run_multimodular(
+        "substitute", [p, var_poly], [var_name], degrees, bound, workers
+    )
+
+
+def enforce_integers(polys):
+    for p in polys:
+        if p.ring is not integer_math.IntegerMath:
+            raise ValueError("We can only do multi-modular arithmetic on integers.")
+
+
+def degree(p, var_name):
+    return max((term.degree_of_var(var_name) for term in p.terms), default=0)
+
+
+def max_abs_coeff(p):
+    return max((abs(term.coeff) for term in p.terms), default=0)
+
+
+def mod_multiply(a, b, moduli):
+    """
+    This multiplies two packed polynomials (see run_multimodular)
+    mod every prime at once.  We loop over the terms of the shorter
+    one.  For each of those terms, the products with the terms of
+    the other one all land in distinct columns, so numpy can add a
+    whole block of products into place at once.
+    """
+    keys1, residues1 = a
+    keys2, residues2 = b
+    if len(keys1) > len(keys2):
+        keys1, residues1, keys2, residues2 = keys2, residues2, keys1, residues1
+
+    index = {}
+    columns = [
+        [index.setdefault(key1 + key2, len(index)) for key2 in keys2]
+        for key1 in keys1
+    ]
+    result = numpy.zeros((len(moduli), len(index)), dtype=numpy.int64)
+    for i, column in enumerate(columns):
+        result[:, column] += residues1[:, i : i + 1] * residues2
+        if i % REDUCE_EVERY == REDUCE_EVERY - 1:
+            result %= moduli
+    result %= moduli
+    return list(index), result
+
+
+def mod_one(moduli):
+    return [0], numpy.ones((len(moduli), 1), dtype=numpy.int64)
+
+
+def mod_power(a, exponent, moduli):
+    """
+    This is repeated squaring, as in Poly.raised_to_exponent.
+    """
+    result = mod_one(moduli)
+    square = a
+    while exponent:
+        if exponent & 1:
+            result = mod_multiply(result, square, moduli)
+        exponent >>= 1
+        if exponent:
+            square = mod_multiply(square, square, moduli)
+    return result
+
+
+def mod_substitute(a, place, radix, b, moduli):
+    """
+    The substituted variable is the digit at place (a power of the
+    radix) of each packed monomial.  We split each monomial into
+    that power and the rest, group the terms by the power, and
+    multiply each group by the matching power of b, which we build
+    up from the smallest exponent, as in Poly.powers.  Then we add
+    up the products.
+    """
+    keys, residues = a
+    groups = {}
+    for i, key in enumerate(keys):
+        exponent = key // place % radix
+        groups.setdefault(exponent, []).append(i)
+
+    index = {}
+    products = []
+    power = mod_one(moduli)
+    prev_exponent = 0
+    for exponent in sorted(groups):
+        for _ in range(exponent - prev_exponent):
+            power = mod_multiply(power, b, moduli)
+        prev_exponent = exponent
+
+        group = groups[exponent]
+        rests = [keys[i] - exponent * place for i in group]
+        product_keys, product = mod_multiply((rests, residues[:, group]), power, moduli)
+        columns = [index.setdefault(key, len(index)) for key in product_keys]
+        products.append((columns, product))
+
+    result = numpy.zeros((len(moduli), len(index)), dtype=numpy.int64)
+    for columns, product in products:
+        result[:, columns] += product
+        result %= moduli
+    return list(index), result
+
+
+def multiply_bound(poly1, poly2):
+    """
+    For any monomial of the product, each term of poly1 pairs with
+    at most one term of poly2, so every coefficient is at most the
+    1-norm of one factor times the biggest coefficient of the other.
+    """
+    return min(
+        one_norm(poly1) * max_abs_coeff(poly2),
+        one_norm(poly2) * max_abs_coeff(poly1),
+    )
+
+
+def one_norm(p):
+    return sum(abs(term.coeff) for term in p.terms)
+
+
+def power_bound(p, exponent):
+    return one_norm(p) ** exponent
+
+
+def primes_for_bound(bound):
+    """
+    This returns the fewest primes whose product is more than
+    2 * bound, which is what we need to recover every integer in
+    the range [-bound, bound].
+    """
+    primes = []
+    product = 1
+    i = 0
+    while product <= 2 * bound:
+        while i >= len(_primes):
+            n = _primes[-1] - 1 if _primes else PRIME_LIMIT - 1
+            while not modulus_math.is_prime(n):
+                n -= 1
+            _primes.append(n)
+        primes.append(_primes[i])
+        product *= _primes[i]
+        i += 1
+    return primes
+
+
+def run_mod_primes(op, primes, packed_polys, args):
+    """
+    This runs in a worker process (or in our own process if
+    workers == 1).  The packed polynomials map keys to integer
+    coefficients, and we return the packed answer mod primes.
+    """
+    moduli = numpy.array(primes, dtype=numpy.int64).reshape(-1, 1)
+    reduced = []
+    for products in packed_polys:
+        residues = numpy.array(
+            [[c % prime for c in products.values()] for prime in primes],
+            dtype=numpy.int64,
+        ).reshape(len(primes), len(products))
+        reduced.append((list(products), residues))
+
+    if op == "multiply":
+        return mod_multiply(reduced[0], reduced[1], moduli)
+    if op == "power":
+        (exponent,) = args
+        return mod_power(reduced[0], exponent, moduli)
+    if op == "substitute":
+        place, radix = args
+        return mod_substitute(reduced[0], place, radix, reduced[1], moduli)
+    raise ValueError(f"Unknown operation {op}")
+
+
+def run_multimodular(op, polys, args, degrees, bound, workers):
+    """
+    This packs the polynomials, does op mod every prime (splitting
+    the primes among the workers), and then combines the results.
+    The degrees list has the biggest exponent that each variable
+    can reach in the answer, which tells us the radix for packing.
+    """
+    enforce_type(workers, int)
+    enforce_integers(polys)
+
+    var_names = sorted(var_name for var_name, _ in degrees)
+    radix = 1 + max((n for _, n in degrees), default=0)
+    places = {}
+    place = 1
+    for var_name in reversed(var_names):
+        places[var_name] = place
+        place *= radix
+
+    packed_polys = []
+    for p in polys:
+        products = {}
+        for term in p.terms:
+            packed = sum(places[var_name] * exponent for var_name, exponent in term.key)
+            products[packed] = term.coeff
+        packed_polys.append(products)
+
+    if op == "substitute":
+        args = [places[args[0]], radix]
+
+    primes = primes_for_bound(bound)
+    if workers == 1:
+        keys, residues = run_mod_primes(op, primes, packed_polys, args)
+    else:
+        """
+        Every worker does the same steps on the same keys, so they
+        all come back with their columns in the same order.
+        """
+        size = -(-len(primes) // workers)
+        chunks = [primes[i : i + size] for i in range(0, len(primes), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_mod_primes, op, chunk, packed_polys, args)
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+        keys = results[0][0]
+        residues = numpy.vstack([residues for _, residues in results])
+
+    coeffs_by_key = {}
+    for packed, coeff in zip(keys, chinese_remainder(residues, primes)):
+        key = []
+        for var_name in reversed(var_names):
+            packed, exponent = divmod(packed, radix)
+            if exponent:
+                key.append((var_name, exponent))
+        coeffs_by_key[tuple(reversed(key))] = coeff
+
+    with poly.using_math(integer_math.IntegerMath):
+        return Poly.from_key_dict(coeffs_by_key)
+
+
+def substitute_bound(p, var_name, var_poly):
+    """
+    A term c*(var_name**e)*rest turns into c*(var_poly**e)*rest,
+    whose 1-norm is at most |c| * one_norm(var_poly)**e.  The 1-norm
+    of the sum is at most the sum of those.
+    """
+    norm = one_norm(var_poly)
+    return sum(
+        abs(term.coeff) * norm ** term.degree_of_var(var_name) for term in p.terms
+    )
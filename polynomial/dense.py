@@ -0,0 +1,439 @@
+from . import integer_math, modulus_math, poly
+from .poly import Poly, _in_ring, enforce_legal_variable_name, enforce_type
+
+"""
+The DensePoly class is an alternative representation for polynomials
+over a single variable.  Rather than a list of _Term objects, we just
+store a list of coefficients, where coeffs[i] is the coefficient of
+x**i.  (This is the same list that Poly.numpy_vector produces.)
+
+    x = Poly.var("x")
+    p = DensePoly.from_poly((x + 1) ** 3)
+    assert p.coeffs == [1, 3, 3, 1]
+    assert (p * p).to_poly() == (x + 1) ** 6
+
+The point of DensePoly is fast multiplication of big polynomials.
+The general Poly machinery multiplies every term by every other term,
+so two polynomials of degree 100000 would need ten billion term
+products.  Here we pick from these algorithms:
+
+    - schoolbook: the usual O(n*m) algorithm (for small inputs)
+    - karatsuba: O(n**1.585), using only Math.add/mul/negate, so it
+      works for any Math type
+    - kronecker: for integers, we pack all the coefficients into one
+      huge Python integer, let Python multiply the two integers, and
+      then unpack the product
+    - ntt: the number-theoretic transform (an FFT over integers mod p)
+      for ModulusMath when the modulus is a prime such as 998244353
+
+DensePoly objects are immutable.  Like a Poly, each DensePoly
+remembers the Math type that it was built with (its ring), and all
+of its operations use that ring, no matter which Math type is in
+effect later on.  DensePoly.from_poly keeps the ring of the Poly.
+We refuse to mix polynomials from different rings.  (We share
+poly._in_ring with Poly for that; see just after the DensePoly class.)
+"""
+
+SCHOOLBOOK_LIMIT = 32
+
+
+class DensePoly:
+    def __init__(self, var_name, coeffs, ring=None):
+        """
+        The ring defaults to the Math type for the current context.
+        """
+        if ring is None:
+            ring = poly.get_math()
+        enforce_legal_variable_name(var_name)
+        enforce_type(coeffs, list)
+        if not poly.trusted_mode:
+            for c in coeffs:
+                enforce_type(c, ring.value_type)
+
+        zero = ring.zero
+        coeffs = list(coeffs)
+        while coeffs and coeffs[-1] == zero:
+            coeffs.pop()
+
+        self.var_name = var_name
+        self.coeffs = coeffs
+        self.ring = ring
+
+    @_in_ring
+    def __add__(self, other):
+        other = self.coerce(other)
+        Math = poly.Math
+        a, b = self.coeffs, other.coeffs
+        if len(a) < len(b):
+            a, b = b, a
+        coeffs = [Math.add(c, d) for c, d in zip(a, b)] + a[len(b) :]
+        return DensePoly(self.var_name, coeffs)
+
+    def __eq__(self, other):
+        enforce_type(other, DensePoly)
+        return (
+            self.var_name == other.var_name
+            and (self.ring is other.ring or self.ring == other.ring)
+            and self.coeffs == other.coeffs
+        )
+
+    @_in_ring
+    def __mul__(self, other):
+        if type(other) == poly.Math.value_type:
+            Math = poly.Math
+            return DensePoly(self.var_name, [Math.mul(other, c) for c in self.coeffs])
+        return self.multiply(other)
+
+    @_in_ring
+    def __neg__(self):
+        Math = poly.Math
+        return DensePoly(self.var_name, [Math.negate(c) for c in self.coeffs])
+
+    @_in_ring
+    def __pow__(self, exponent):
+        enforce_type(exponent, int)
+        if exponent < 0:
+            raise ValueError("we do not support negative exponents")
+
+        result = DensePoly(self.var_name, [poly.Math.one])
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            exponent >>= 1
+            if exponent:
+                base = base * base
+        return result
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __str__(self):
+        return str(self.to_poly())
+
+    @_in_ring
+    def __sub__(self, other):
+        return self + (-self.coerce(other))
+
+    @_in_ring
+    def coerce(self, other):
+        """
+        Constants get turned into degree-zero polynomials.
+        """
+        if type(other) == poly.Math.value_type:
+            return DensePoly(self.var_name, [other])
+        enforce_type(other, DensePoly)
+        if other.var_name != self.var_name and other.degree() > 0:
+            raise ValueError("We can only combine polynomials over the same variable.")
+        return other
+
+    def degree(self):
+        """
+        We say that the zero polynomial has degree -1.
+        """
+        return len(self.coeffs) - 1
+
+    @_in_ring
+    def eval(self, value):
+        """
+        We use Horner's method here:
+
+            a + b*x + c*x**2 == a + x*(b + x*c)
+        """
+        Math = poly.Math
+        enforce_type(value, Math.value_type)
+        result = Math.zero
+        for c in reversed(self.coeffs):
+            result = Math.add(Math.mul(result, value), c)
+        return result
+
+    @_in_ring
+    def multiply(self, other, method="auto"):
+        """
+        See the module docstring for the available methods.  With
+        "auto" we choose based on the Math type and the sizes.
+        """
+        other = self.coerce(other)
+        a, b = self.coeffs, other.coeffs
+        if not a or not b:
+            return DensePoly(self.var_name, [])
+
+        if method == "auto":
+            method = choose_method(len(a), len(b))
+
+        if method == "schoolbook":
+            coeffs = schoolbook_multiply(a, b)
+        elif method == "karatsuba":
+            coeffs = karatsuba_multiply(a, b)
+        elif method == "kronecker":
+            coeffs = kronecker_multiply(a, b)
+        elif method == "ntt":
+            coeffs = ntt_multiply(a, b, poly.Math.modulus)
+        else:
+            raise ValueError(f"Unknown multiplication method {method}")
+
+        return DensePoly(self.var_name, coeffs)
+
+    @_in_ring
+    def to_poly(self):
+        var_name = self.var_name
+        coeffs_by_key = {}
+        for i, c in enumerate(self.coeffs):
+            key = ((var_name, i),) if i > 0 else ()
+            coeffs_by_key[key] = c
+        return Poly.from_key_dict(coeffs_by_key)
+
+    @staticmethod
+    def from_poly(p, var_name=None):
+        """
+        The var_name is only needed if p is a constant, since then
+        we can't tell what variable it should be over.  We use the
+        ring of p.
+        """
+        enforce_type(p, Poly)
+        var_names = p.variables()
+        if len(var_names) > 1:
+            raise ValueError("This only works for polynomials over a single variable")
+        if var_names:
+            p_var_name = list(var_names)[0]
+            if var_name is not None and var_name != p_var_name:
+                raise ValueError(f"{p} is not a polynomial over {var_name}")
+            var_name = p_var_name
+        if var_name is None:
+            raise ValueError("Supply a var_name for constant polynomials.")
+
+        if p.is_zero():
+            return DensePoly(var_name, [], p.ring)
+        coeffs = [p.ring.zero] * (1 + max(t.degree_of_var(var_name) for t in p.terms))
+        for term in p.terms:
+            coeffs[term.degree_of_var(var_name)] = term.coeff
+        return DensePoly(var_name, coeffs, p.ring)
+
+
+poly._RING_TYPES.add(DensePoly)
+
+
+def choose_method(n, m):
+    Math = poly.get_math()
+    if min(n, m) <= SCHOOLBOOK_LIMIT:
+        return "schoolbook"
+    if Math is integer_math.IntegerMath:
+        return "kronecker"
+    if type(Math) == modulus_math.ModulusMath:
+        if Math.is_prime and ntt_is_possible(Math.modulus, n + m - 1):
+            return "ntt"
+        return "kronecker"
+    return "karatsuba"
+
+
+def schoolbook_multiply(a, b):
+    Math = poly.Math
+    result = [Math.zero] * (len(a) + len(b) - 1)
+    for i, c in enumerate(a):
+        if c == Math.zero:
+            continue
+        for j, d in enumerate(b):
+            result[i + j] = Math.add(result[i + j], Math.mul(c, d))
+    return result
+
+
+def karatsuba_multiply(a, b):
+    """
+    Split a = a0 + a1*x**k and b = b0 + b1*x**k.  Then
+
+        a*b = a0*b0 + ((a0+a1)*(b0+b1) - a0*b0 - a1*b1)*x**k + a1*b1*x**(2k)
+
+    which needs three half-size products instead of four.
+    """
+    Math = poly.Math
+    n, m = len(a), len(b)
+    if min(n, m) <= SCHOOLBOOK_LIMIT:
+        return schoolbook_multiply(a, b)
+
+    k = max(n, m) // 2
+    a0, a1 = a[:k], a[k:]
+    b0, b1 = b[:k], b[k:]
+    if not a1 or not b1:
+        # One side is much shorter than the other, so just split
+        # the long side.
+        if not a1:
+            return add_shifted(
+                karatsuba_multiply(a, b0), karatsuba_multiply(a, b1), k
+            )
+        return add_shifted(karatsuba_multiply(a0, b), karatsuba_multiply(a1, b), k)
+
+    low = karatsuba_multiply(a0, b0)
+    high = karatsuba_multiply(a1, b1)
+    middle = karatsuba_multiply(add_lists(a0, a1), add_lists(b0, b1))
+    middle = add_lists(middle, [Math.negate(c) for c in add_lists(low, high)])
+
+    result = add_shifted(low, middle, k)
+    return add_shifted(result, high, 2 * k)
+
+
+def add_lists(a, b):
+    Math = poly.Math
+    if len(a) < len(b):
+        a, b = b, a
+    return [Math.add(c, d) for c, d in zip(a, b)] + a[len(b) :]
+
+
+def add_shifted(a, b, shift):
+    """
+    This computes a + b*x**shift.
+    """
+    Math = poly.Math
+    result = list(a) + [Math.zero] * max(0, shift + len(b) - len(a))
+    for i, c in enumerate(b):
+        result[i + shift] = Math.add(result[i + shift], c)
+    return result
+
+
+def kronecker_multiply(a, b):
+    """
+    If all our coefficients are small compared to 2**k, then the
+    coefficients of a*b can be read right out of the digits (in
+    base 2**k) of the integer product a(2**k) * b(2**k).
+
+    Negative coefficients make this a little trickier.  We pack the
+    positive and negative coefficients separately, and when we
+    unpack we treat each k-bit chunk as a signed value and borrow
+    from the next chunk.
+
+    Python's big integer multiplication is written in C, so this
+    beats anything that we could write with Python loops.
+
+    For ModulusMath we multiply the representatives 0..modulus-1
+    as integers and reduce at the end.
+    """
+    Math = poly.get_math()
+    reduce_mod = None
+    if Math is not integer_math.IntegerMath:
+        reduce_mod = Math.modulus
+
+    bound = max(abs(c) for c in a) * max(abs(c) for c in b) * min(len(a), len(b))
+    slot_bytes = (bound.bit_length() + 2 + 7) // 8
+    slot_bits = 8 * slot_bytes
+
+    def pack(coeffs):
+        positive = b"".join(
+            (c if c > 0 else 0).to_bytes(slot_bytes, "little") for c in coeffs
+        )
+        negative = b"".join(
+            (-c if c < 0 else 0).to_bytes(slot_bytes, "little") for c in coeffs
+        )
+        return int.from_bytes(positive, "little") - int.from_bytes(negative, "little")
+
+    product = pack(a) * pack(b)
+
+    n = len(a) + len(b) - 1
+    data = product.to_bytes(n * slot_bytes + 1, "little", signed=True)
+    half = 1 << (slot_bits - 1)
+    full = 1 << slot_bits
+    result = []
+    borrow = 0
+    for i in range(n):
+        c = int.from_bytes(data[i * slot_bytes : (i + 1) * slot_bytes], "little")
+        c += borrow
+        if c >= half:
+            c -= full
+            borrow = 1
+        else:
+            borrow = 0
+        result.append(c)
+
+    if reduce_mod is not None:
+        result = [c % reduce_mod for c in result]
+    return result
+
+
+def ntt_is_possible(prime, size):
+    """
+    We need a primitive root of unity of order 2**k >= size, which
+    exists iff 2**k divides prime - 1.  The caller makes sure that
+    the modulus is prime (ModulusMath checks that just once, when
+    we build it).
+    """
+    length = 1
+    while length < size:
+        length *= 2
+    return (prime - 1) % length == 0
+
+
+def primitive_root(prime):
+    factors = set()
+    n = prime - 1
+    d = 2
+    while d * d <= n:
+        while n % d == 0:
+            factors.add(d)
+            n //= d
+        d += 1
+    if n > 1:
+        factors.add(n)
+
+    for g in range(2, prime):
+        if all(pow(g, (prime - 1) // f, prime) != 1 for f in factors):
+            return g
+    return 1
+
+
+def ntt(values, prime, root):
+    """
+    This is the standard iterative Cooley-Tukey transform, over the
+    integers mod prime, where root has order len(values).  We
+    transform the values in place.
+    """
+    n = len(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            values[i], values[j] = values[j], values[i]
+
+    length = 2
+    while length <= n:
+        w_length = pow(root, n // length, prime)
+        half = length // 2
+        twiddles = [1] * half
+        for i in range(1, half):
+            twiddles[i] = twiddles[i - 1] * w_length % prime
+        for start in range(0, n, length):
+            for i in range(half):
+                u = values[start + i]
+                v = values[start + i + half] * twiddles[i] % prime
+                values[start + i] = (u + v) % prime
+                values[start + i + half] = (u - v) % prime
+        length *= 2
+
+
+def ntt_multiply(a, b, prime):
+    """
+    Transform both coefficient lists, multiply pointwise, and
+    transform back.  The result is exact mod prime.
+    """
+    size = len(a) + len(b) - 1
+    if not modulus_math.is_prime(prime) or not ntt_is_possible(prime, size):
+        raise ValueError(f"We can't do an NTT of size {size} mod {prime}.")
+
+    n = 1
+    while n < size:
+        n *= 2
+    root = pow(primitive_root(prime), (prime - 1) // n, prime)
+
+    fa = list(a) + [0] * (n - len(a))
+    fb = list(b) + [0] * (n - len(b))
+    ntt(fa, prime, root)
+    ntt(fb, prime, root)
+    product = [x * y % prime for x, y in zip(fa, fb)]
+    ntt(product, prime, pow(root, -1, prime))
+
+    n_inverse = pow(n, -1, prime)
+    return [c * n_inverse % prime for c in product[:size]]
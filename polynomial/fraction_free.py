@@ -0,0 +1,297 @@
+import math
+from fractions import Fraction
+from . import fraction_math, integer_math, poly
+from .poly import Poly, enforce_type
+
+"""
+A FractionFreePoly is a polynomial with rational coefficients that
+we store as a single Fraction (the scale) times a polynomial with
+integer coefficients.  So the same polynomial as
+
+    p = (x + Fraction(1, 3)) * (y - Fraction(2, 5))
+
+under FractionMath is
+
+    q = FractionFreePoly.from_poly(p)
+    assert q.scale == Fraction(1, 15)
+    assert str(q.poly) == "15*x*y+(-6)*x+5*y+(-2)"
+    assert str(q) == str(p)
+    values = dict(x=Fraction(1, 2), y=Fraction(7))
+    assert q.eval(**values) == p.eval(**values)
+
+With FractionMath, every add and mul makes a new Fraction, which
+means a gcd to put it in lowest terms.  Here the arithmetic on the
+coefficients is all done by IntegerMath, and we only touch Fractions
+for the scale.
+
+We keep track of the "content" of our integer polynomial, which is
+the gcd of its coefficients.  If the content is 1, the polynomial is
+"primitive", and then our form is unique once we also make the
+leading coefficient (the first one in canonical order) positive.
+Gauss's lemma says that the content of a product is the product of
+the contents, so multiplying two primitive polynomials gives us a
+primitive polynomial for free.  After an addition we don't know the
+content, and we don't compute it until somebody needs it, which is
+either a multiplication (since we want to multiply the smallest
+integers that we can) or something like str or ==.
+
+FractionFreePoly objects are immutable, and they always do their
+integer arithmetic with IntegerMath, no matter which Math type is in
+effect for the current context.
+"""
+
+
+class FractionFreePoly:
+    def __init__(self, scale, p, content=None):
+        """
+        The content should be None if we don't know it yet.
+        """
+        enforce_type(scale, Fraction)
+        enforce_type(p, Poly)
+        if p.ring is not integer_math.IntegerMath:
+            raise ValueError("We need a polynomial over the integers.")
+        if scale == 0 or p.is_zero():
+            scale = Fraction(0)
+            p = FractionFreePoly.integer_poly({})
+            content = 1
+
+        self.scale = scale
+        self.poly = p
+        self.known_content = content
+
+    def __add__(self, other):
+        """
+        If our scales are a/b and c/d, then we put everything over
+        lcm(b, d), which leaves us with integer multipliers for the
+        two integer polynomials.
+        """
+        other = FractionFreePoly.coerce(other)
+        if other.is_zero():
+            return self
+        if self.is_zero():
+            return other
+
+        denominator = math.lcm(self.scale.denominator, other.scale.denominator)
+        m1 = self.scale.numerator * (denominator // self.scale.denominator)
+        m2 = other.scale.numerator * (denominator // other.scale.denominator)
+        p = self.poly * m1 + other.poly * m2
+        return FractionFreePoly(Fraction(1, denominator), p)
+
+    def __eq__(self, other):
+        other = FractionFreePoly.coerce(other)
+        a = self.normalized()
+        b = other.normalized()
+        return a.scale == b.scale and a.poly == b.poly
+
+    def __mul__(self, other):
+        if type(other) in (int, Fraction):
+            return FractionFreePoly(self.scale * other, self.poly, self.known_content)
+
+        other = FractionFreePoly.coerce(other)
+        a = self.normalized()
+        b = other.normalized()
+        return FractionFreePoly(a.scale * b.scale, a.poly * b.poly, 1)
+
+    def __neg__(self):
+        return FractionFreePoly(-self.scale, self.poly, self.known_content)
+
+    def __pow__(self, exponent):
+        """
+        The power of a primitive polynomial is primitive, so we
+        just raise the scale and the integer polynomial separately.
+        """
+        enforce_type(exponent, int)
+        if exponent < 0:
+            raise ValueError("we do not support negative exponents")
+        a = self.normalized()
+        return FractionFreePoly(a.scale**exponent, a.poly**exponent, 1)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __rsub__(self, other):
+        return FractionFreePoly.coerce(other) + (-self)
+
+    def __str__(self):
+        return str(self.to_poly())
+
+    def __sub__(self, other):
+        return self + (-FractionFreePoly.coerce(other))
+
+    def content(self):
+        """
+        This is the Fraction c such that we equal c times our
+        primitive part (see primitive_part).
+        """
+        return self.normalized().scale
+
+    def eval(self, **var_assignments):
+        """
+        If x = a/b, and x shows up with degree at most D, then we
+        multiply each term that has x**e by a**e * b**(D-e), which is
+        an integer, and divide the whole sum by b**D at the end.  We
+        do the same for every variable, so we only make one Fraction
+        (besides our scale).
+        """
+        my_var_names = self.poly.variables()
+        poly.enforce_dict_types(var_assignments, str, Fraction)
+        for var_name in my_var_names:
+            if var_name not in var_assignments:
+                raise ValueError(f"The var {var_name} was not supplied.")
+
+        degrees = {var_name: 0 for var_name in my_var_names}
+        for term in self.poly.terms:
+            for var_name, exponent in term.key:
+                degrees[var_name] = max(degrees[var_name], exponent)
+
+        numerator_powers = {}
+        denominator_powers = {}
+        denominator = 1
+        for var_name, degree in degrees.items():
+            value = var_assignments[var_name]
+            numerator_powers[var_name] = powers(value.numerator, degree)
+            denominator_powers[var_name] = powers(value.denominator, degree)
+            denominator *= denominator_powers[var_name][degree]
+
+        total = 0
+        for term in self.poly.terms:
+            exponents = dict(term.key)
+            product = term.coeff
+            for var_name, degree in degrees.items():
+                exponent = exponents.get(var_name, 0)
+                product *= numerator_powers[var_name][exponent]
+                product *= denominator_powers[var_name][degree - exponent]
+            total += product
+        return self.scale * Fraction(total, denominator)
+
+    def is_zero(self):
+        return self.poly.is_zero()
+
+    def normalized(self):
+        """
+        This returns the same polynomial in the unique form where
+        our integer polynomial is primitive and has a positive
+        leading coefficient.  We divide out the content here.
+        """
+        if self.is_zero():
+            return self
+        content = self.known_content
+        if content == 1 and self.poly.terms[0].coeff > 0:
+            return self
+        if content is None:
+            content = math.gcd(*(term.coeff for term in self.poly.terms))
+        if self.poly.terms[0].coeff < 0:
+            content = -content
+        if content == 1:
+            return FractionFreePoly(self.scale, self.poly, 1)
+        p = self.poly.transform_coefficients(lambda c: c // content)
+        return FractionFreePoly(self.scale * content, p, 1)
+
+    def primitive_part(self):
+        """
+        This is an integer Poly whose coefficients have no common
+        factor, such that we equal content() * primitive_part().
+        """
+        return self.normalized().poly
+
+    def substitute(self, var_name, other):
+        """
+        If other is (a/b) * q, then we use the same trick as eval:
+        a term with var_name**e gets multiplied by a**e * b**(D-e),
+        where D is the degree of var_name, and then we substitute q
+        for var_name and divide by b**D.
+        """
+        enforce_type(var_name, str)
+        other = FractionFreePoly.coerce(other).normalized()
+        if var_name not in self.poly.variables():
+            raise ValueError("Unknown variable")
+
+        a = other.scale.numerator
+        b = other.scale.denominator
+        degree = max(term.degree_of_var(var_name) for term in self.poly.terms)
+        a_powers = powers(a, degree)
+        b_powers = powers(b, degree)
+
+        coeffs_by_key = {}
+        for term in self.poly.terms:
+            exponent = term.degree_of_var(var_name)
+            coeffs_by_key[term.key] = (
+                term.coeff * a_powers[exponent] * b_powers[degree - exponent]
+            )
+        p = FractionFreePoly.integer_poly(coeffs_by_key)
+        if other.is_zero():
+            """
+            Since a == 0, the terms with var_name are already gone.
+            """
+            return FractionFreePoly(self.scale / b_powers[degree], p)
+        return FractionFreePoly(
+            self.scale / b_powers[degree], p.substitute(var_name, other.poly)
+        )
+
+    def to_poly(self):
+        """
+        This gives you a Poly with FractionMath coefficients.
+        """
+        scale = self.scale
+        coeffs_by_key = {term.key: scale * term.coeff for term in self.poly.terms}
+        with poly.using_math(fraction_math.FractionMath):
+            return Poly.from_key_dict(coeffs_by_key)
+
+    @staticmethod
+    def coerce(other):
+        """
+        Integers and Fractions get turned into constant polynomials.
+        """
+        if type(other) in (int, Fraction):
+            one = FractionFreePoly.integer_poly({(): 1})
+            return FractionFreePoly(Fraction(other), one)
+        enforce_type(other, FractionFreePoly)
+        return other
+
+    @staticmethod
+    def from_poly(p):
+        """
+        The polynomial p can be over FractionMath or IntegerMath.
+        We scale its coefficients up by the lcm of their
+        denominators, so that they are all integers.
+        """
+        enforce_type(p, Poly)
+        if p.ring is integer_math.IntegerMath:
+            return FractionFreePoly(Fraction(1), p)
+        if p.ring is not fraction_math.FractionMath:
+            raise ValueError(
+                "We can only convert FractionMath or IntegerMath polynomials."
+            )
+
+        denominator = math.lcm(*(term.coeff.denominator for term in p.terms))
+        coeffs_by_key = {
+            term.key: term.coeff.numerator * (denominator // term.coeff.denominator)
+            for term in p.terms
+        }
+        return FractionFreePoly(
+            Fraction(1, denominator), FractionFreePoly.integer_poly(coeffs_by_key)
+        )
+
+    @staticmethod
+    def integer_poly(coeffs_by_key):
+        with poly.using_math(integer_math.IntegerMath):
+            return Poly.from_key_dict(coeffs_by_key)
+
+    @staticmethod
+    def var(var_name):
+        return FractionFreePoly(
+            Fraction(1), FractionFreePoly.integer_poly({((var_name, 1),): 1}), 1
+        )
+
+
+def powers(n, degree):
+    """
+    This returns [n**0, n**1, ..., n**degree].
+    """
+    result = [1]
+    for _ in range(degree):
+        result.append(result[-1] * n)
+    return result
@@ -1,3 +1,4 @@
+import math
 from fractions import Fraction
 
 
@@ -17,12 +18,33 @@ class FractionMath:
         assert type(c) == Fraction
         return str(c) if c > 0 else f"({c})"
 
+    @staticmethod
+    def convert(value):
+        return Fraction(value)
+
+    @staticmethod
+    def dot(coeffs, values):
+        assert all(type(c) == Fraction for c in coeffs)
+        assert all(type(v) == Fraction for v in values)
+        return FractionMath.sum_many([a * b for a, b in zip(coeffs, values)])
+
     @staticmethod
     def mul(a, b):
         assert type(a) == Fraction
         assert type(b) == Fraction
         return a * b
 
+    @staticmethod
+    def mul_many(values):
+        """
+        We multiply the numerators and denominators separately, so
+        that we only reduce the result once.
+        """
+        assert all(type(v) == Fraction for v in values)
+        numerator = math.prod(v.numerator for v in values)
+        denominator = math.prod(v.denominator for v in values)
+        return Fraction(numerator, denominator)
+
     @staticmethod
     def negate(n):
         assert type(n) == Fraction
@@ -33,3 +55,15 @@ class FractionMath:
         assert type(n) == Fraction
         assert type(exp) == int
         return n**exp
+
+    @staticmethod
+    def sum_many(values):
+        """
+        Adding fractions one at a time reduces every partial sum.
+        Instead we put everything over a common denominator, add up
+        the numerators as integers, and reduce once at the end.
+        """
+        assert all(type(v) == Fraction for v in values)
+        denominator = math.lcm(*(v.denominator for v in values))
+        numerator = sum(v.numerator * (denominator // v.denominator) for v in values)
+        return Fraction(numerator, denominator)
@@ -1,3 +1,7 @@
+import math
+import operator
+
+
 class IntegerMath:
     zero = 0
     one = 1
@@ -17,12 +21,33 @@ class IntegerMath:
         assert type(c) == int
         return str(c) if c > 0 else f"({c})"
 
+    @staticmethod
+    def convert(value):
+        """
+        This is for Poly.to_ring.  Fractions are only OK if they are
+        whole numbers.
+        """
+        if getattr(value, "denominator", 1) != 1:
+            raise ValueError(f"{value} is not an integer")
+        return int(value)
+
+    @staticmethod
+    def dot(coeffs, values):
+        assert all(type(c) == int for c in coeffs)
+        assert all(type(v) == int for v in values)
+        return sum(map(operator.mul, coeffs, values))
+
     @staticmethod
     def mul(a, b):
         assert type(a) == int
         assert type(b) == int
         return a * b
 
+    @staticmethod
+    def mul_many(values):
+        assert all(type(v) == int for v in values)
+        return math.prod(values)
+
     @staticmethod
     def negate(n):
         assert type(n) == int
@@ -33,3 +58,8 @@ class IntegerMath:
         assert type(n) == int
         assert type(exp) == int
         return n**exp
+
+    @staticmethod
+    def sum_many(values):
+        assert all(type(v) == int for v in values)
+        return sum(values)
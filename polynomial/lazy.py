@@ -0,0 +1,270 @@
+import weakref
+from . import poly
+from .poly import Poly, enforce_type
+
+"""
+Poly objects are simplified and put in canonical order as soon as
+they are built.  That is usually what you want, but if you build up
+a big polynomial through a long chain of operations, such as
+
+    total = Poly.zero()
+    for i in range(1000):
+        total = total + p_list[i] * q_list[i]
+
+then we canonicalize a thousand intermediate sums that nobody
+ever looks at.
+
+LazyPoly is an opt-in alternative.  Operators on LazyPoly objects
+just record what you asked for in an expression graph:
+
+    x = Poly.var("x").lazy()
+    y = Poly.var("y").lazy()
+    e = (x + y) ** 20 - (x - y) ** 20
+
+Nothing gets expanded until you look at the result through str(),
+==, terms, or expand().  At that point, we expand each node of the
+graph exactly once, and we add up long chains of sums with a single
+call to Poly.sum.
+
+We also share common subexpressions: if you build x + y twice, you
+get the same node back both times, so it only gets expanded once.
+
+Finally, you can call eval on a LazyPoly, which computes its value
+directly from the graph without ever expanding it.
+
+Each node has the ring of the Poly objects at its leaves (see
+Poly.ring), and, as with Poly, we refuse to mix rings.
+"""
+
+"""
+The node table maps a description of a node, such as
+("mul", id(a), id(b)), to the node itself.  We only hold weak
+references to nodes, and a node holds strong references to its
+children, so the ids in any live entry always refer to live
+objects.
+"""
+_nodes = weakref.WeakValueDictionary()
+
+
+class LazyPoly:
+    def __init__(self, op, children, poly=None, exponent=None):
+        """
+        Use LazyPoly.node (or Poly.lazy) rather than calling this
+        directly, so that we can share common subexpressions.
+        """
+        if poly is not None:
+            ring = poly.ring
+        else:
+            ring = children[0].ring
+            for child in children:
+                if child.ring is not ring and child.ring != ring:
+                    raise ValueError(
+                        f"We cannot mix polynomials over {ring} and {child.ring}."
+                    )
+
+        self.op = op
+        self.children = children
+        self.exponent = exponent
+        self.expanded = poly
+        self.ring = ring
+
+    def __add__(self, other):
+        return LazyPoly.add(self, LazyPoly.coerce(other, self.ring))
+
+    def __eq__(self, other):
+        """
+        We compare equal to a LazyPoly or a Poly with the same
+        expansion.  (Poly.__eq__ hands comparisons with us over to
+        this method, so poly == lazy works, too.)
+        """
+        if type(other) == LazyPoly:
+            other = other.expand()
+        if type(other) != Poly:
+            return NotImplemented
+        return self.expand() == other
+
+    def __mul__(self, other):
+        return LazyPoly.mul(self, LazyPoly.coerce(other, self.ring))
+
+    def __neg__(self):
+        return LazyPoly.node("neg", (self,))
+
+    def __pow__(self, exponent):
+        enforce_type(exponent, int)
+        if exponent < 0:
+            raise ValueError("we do not support negative exponents")
+        if exponent == 1:
+            return self
+        return LazyPoly.node("pow", (self,), exponent=exponent)
+
+    def __radd__(self, other):
+        return LazyPoly.add(LazyPoly.coerce(other, self.ring), self)
+
+    def __rmul__(self, other):
+        return LazyPoly.mul(LazyPoly.coerce(other, self.ring), self)
+
+    def __rsub__(self, other):
+        return LazyPoly.coerce(other, self.ring) + (-self)
+
+    def __str__(self):
+        return str(self.expand())
+
+    def __sub__(self, other):
+        return self + (-LazyPoly.coerce(other, self.ring))
+
+    def canonicalized_string(self):
+        return self.expand().canonicalized_string()
+
+    def eval(self, **var_assignments):
+        """
+        This computes the value of our expression without expanding
+        it (unless we were already expanded).  Shared subexpressions
+        only get evaluated once.  We do the arithmetic in our ring.
+        """
+        if poly.get_math() is not self.ring:
+            with poly.using_math(self.ring):
+                return self.eval(**var_assignments)
+
+        Math = poly.Math
+        values = {}
+        for node in self.post_order():
+            if node.expanded is not None:
+                value = node.expanded.eval(**var_assignments)
+            elif node.op == "add":
+                value = poly.math_sum_many(
+                    [values[id(operand)] for operand in node.operands()]
+                )
+            elif node.op == "mul":
+                a, b = node.children
+                value = Math.mul(values[id(a)], values[id(b)])
+            elif node.op == "neg":
+                value = Math.negate(values[id(node.children[0])])
+            elif node.op == "pow":
+                value = Math.power(values[id(node.children[0])], node.exponent)
+            values[id(node)] = value
+        return values[id(self)]
+
+    def expand(self):
+        """
+        This returns the equivalent Poly.  We remember it, so we
+        only ever do the work once per node.
+        """
+        for node in self.post_order():
+            if node.expanded is not None:
+                continue
+            children = [operand.expanded for operand in node.operands()]
+            if node.op == "add":
+                node.expanded = Poly.sum(children)
+            elif node.op == "mul":
+                node.expanded = Poly.multiply_polys(*children)
+            elif node.op == "neg":
+                node.expanded = children[0].negated()
+            elif node.op == "pow":
+                node.expanded = children[0].raised_to_exponent(node.exponent)
+        return self.expanded
+
+    def operands(self):
+        """
+        For a sum, this lists everything that we add up.  We look
+        through any child sums that haven't been expanded, so a long
+        chain of additions turns into one big list, and expand can
+        add it up with one call to Poly.sum.  For other nodes, this
+        is just our children.
+        """
+        if self.op != "add":
+            return self.children
+        result = []
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if node.op == "add" and node.expanded is None:
+                stack.extend(reversed(node.children))
+            else:
+                result.append(node)
+        return result
+
+    def post_order(self):
+        """
+        This lists every node of our graph once, with operands
+        before the nodes that use them (see operands), so the sums
+        inside of a chain of sums don't show up on their own.  We
+        avoid recursion, since chains of operations can get very
+        deep.  We don't need to look inside nodes that have already
+        been expanded.
+        """
+        result = []
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                result.append(node)
+                continue
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.append((node, True))
+            if node.expanded is None:
+                for operand in node.operands():
+                    if id(operand) not in seen:
+                        stack.append((operand, False))
+        return result
+
+    @property
+    def terms(self):
+        return self.expand().terms
+
+    def variables(self):
+        return self.expand().variables()
+
+    @staticmethod
+    def add(a, b):
+        """
+        A sum node just has two children, so adding one more term
+        to a long sum doesn't copy the sum.  We flatten chains of
+        sums when we expand them (see operands).  Addition is
+        commutative, so we order the children by id, which makes
+        a + b and b + a the same node.
+        """
+        if id(b) < id(a):
+            a, b = b, a
+        return LazyPoly.node("add", (a, b))
+
+    @staticmethod
+    def coerce(other, ring=None):
+        """
+        Constants become constant polynomials in the given ring
+        (by default, the ring for the current context).
+        """
+        if type(other) == LazyPoly:
+            return other
+        if ring is None:
+            ring = poly.get_math()
+        if type(other) == ring.value_type:
+            with poly.using_math(ring):
+                other = Poly.constant(other)
+        enforce_type(other, Poly)
+        return LazyPoly.leaf(other)
+
+    @staticmethod
+    def leaf(p):
+        enforce_type(p, Poly)
+        return LazyPoly.node("poly", (), poly=p)
+
+    @staticmethod
+    def mul(a, b):
+        if id(b) < id(a):
+            a, b = b, a
+        return LazyPoly.node("mul", (a, b))
+
+    @staticmethod
+    def node(op, children, poly=None, exponent=None):
+        if op == "poly":
+            key = (op, id(poly))
+        else:
+            key = (op, exponent) + tuple(id(child) for child in children)
+        node = _nodes.get(key)
+        if node is None:
+            node = LazyPoly(op, children, poly=poly, exponent=exponent)
+            _nodes[key] = node
+        return node
@@ -1,15 +1,101 @@
+import operator
+
+
+def is_prime(n):
+    """
+    This is a Miller-Rabin test.  The bases below are enough to make
+    it deterministic for n < 3.3 * 10**24, which is far beyond any
+    modulus that you would want to use for a multiplication table.
+    """
+    assert type(n) == int
+    if n < 2:
+        return False
+    small_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    for p in small_primes:
+        if n % p == 0:
+            return n == p
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in small_primes:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
 class ModulusMath:
-    def __init__(self, modulus):
+    """
+    This handles arithmetic modulo some positive integer.
+
+    For small moduli (see TABLE_LIMIT) we precompute a full
+    multiplication table, plus the sequence of powers of every
+    value.  Powers of a value mod n eventually repeat, so we only
+    need to store each sequence up to the point where it starts
+    cycling.
+
+    Otherwise power uses Python's built-in three-argument pow,
+    which needs O(log exponent) multiplications.
+
+    If the modulus is prime, every non-zero value has a
+    multiplicative inverse, and we remember the ones we compute.
+    We test the modulus once, up front, and store the answer in
+    is_prime, so that dense.py can pick the NTT for prime moduli
+    without testing the modulus on every multiplication.
+    """
+
+    TABLE_LIMIT = 256
+
+    def __init__(self, modulus, use_tables=None):
         assert modulus > 0
         assert type(modulus) == int
         self.zero = 0
         self.one = 1
         self.value_type = int
         self.modulus = modulus
+        self.is_prime = is_prime(modulus)
+        self.inverses = {}
+
+        if use_tables is None:
+            use_tables = modulus <= ModulusMath.TABLE_LIMIT
+        self.use_tables = use_tables
+
+        if use_tables:
+            self.mul_table = [
+                [a * b % modulus for b in range(modulus)] for a in range(modulus)
+            ]
+            self.power_sequences = [
+                self.power_sequence(a) for a in range(modulus)
+            ]
+            self.mul = self.table_mul
+            self.power = self.table_power
+
+    def __eq__(self, other):
+        """
+        Two handlers with the same modulus describe the same ring,
+        whether or not they use tables.
+        """
+        return type(other) == ModulusMath and other.modulus == self.modulus
+
+    def __hash__(self):
+        return hash(("ModulusMath", self.modulus))
+
+    def __repr__(self):
+        return f"ModulusMath({self.modulus})"
 
     def add(self, a, b):
-        self.check(a)
-        self.check(b)
+        assert type(a) == int and 0 <= a < self.modulus
+        assert type(b) == int and 0 <= b < self.modulus
         return (a + b) % self.modulus
 
     def check(self, x):
@@ -21,23 +107,99 @@ class ModulusMath:
         assert type(c) == int
         return str(c) if c > 0 else f"({c})"
 
+    def convert(self, value):
+        """
+        This is for Poly.to_ring.  We reduce integers, and a fraction
+        a/b becomes a times the inverse of b (if b has an inverse).
+        """
+        denominator = getattr(value, "denominator", 1)
+        numerator = int(value * denominator)
+        result = numerator % self.modulus
+        if denominator != 1:
+            result = self.mul(result, self.inverse(denominator % self.modulus))
+        return result
+
+    def dot(self, coeffs, values):
+        for n in coeffs:
+            self.check(n)
+        for n in values:
+            self.check(n)
+        return sum(map(operator.mul, coeffs, values)) % self.modulus
+
+    def inverse(self, n):
+        """
+        This returns m such that n*m == 1 (mod modulus).  It raises
+        ValueError if there is no such value.
+        """
+        self.check(n)
+        if n not in self.inverses:
+            self.inverses[n] = pow(n, -1, self.modulus)
+        return self.inverses[n]
+
     def mul(self, a, b):
-        self.check(a)
-        self.check(b)
-        return (a * b) % self.modulus
+        assert type(a) == int and 0 <= a < self.modulus
+        assert type(b) == int and 0 <= b < self.modulus
+        return a * b % self.modulus
+
+    def mul_many(self, values):
+        """
+        We reduce after every step, so that the products stay small.
+        """
+        result = 1 % self.modulus
+        for n in values:
+            self.check(n)
+            result = result * n % self.modulus
+        return result
 
     def negate(self, n):
         self.check(n)
-        return self.modulus - n
+        return -n % self.modulus
 
     def power(self, n, exponent):
         self.check(n)
         assert type(exponent) == int
         assert exponent >= 0
 
-        def repeated_multiply(exp):
-            if exp == 0:
-                return 1
-            return self.mul(n, repeated_multiply(exp - 1))
+        if exponent == 0:
+            return 1
+        return pow(n, exponent, self.modulus)
+
+    def power_sequence(self, n):
+        """
+        This returns (powers, cycle_start), where powers lists
+        n**0, n**1, n**2, ... (mod modulus) up to the first repeat,
+        and the powers from index cycle_start onward repeat forever.
+        """
+        seen = {}
+        powers = []
+        value = 1
+        while value not in seen:
+            seen[value] = len(powers)
+            powers.append(value)
+            value = value * n % self.modulus
+        return powers, seen[value]
+
+    def sum_many(self, values):
+        """
+        Python integers don't overflow, so we can add everything up
+        and then reduce just once.
+        """
+        for n in values:
+            self.check(n)
+        return sum(values) % self.modulus
+
+    def table_mul(self, a, b):
+        assert type(a) == int and 0 <= a < self.modulus
+        assert type(b) == int and 0 <= b < self.modulus
+        return self.mul_table[a][b]
+
+    def table_power(self, n, exponent):
+        self.check(n)
+        assert type(exponent) == int
+        assert exponent >= 0
 
-        return repeated_multiply(exponent)
+        powers, cycle_start = self.power_sequences[n]
+        if exponent < len(powers):
+            return powers[exponent]
+        period = len(powers) - cycle_start
+        return powers[cycle_start + (exponent - cycle_start) % period]
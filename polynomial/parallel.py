@@ -0,0 +1,129 @@
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor
+from . import poly
+from .poly import Poly, enforce_type
+
+"""
+Multiplying two big polynomials is CPU-bound pure Python, so by
+default it only uses one core.  parallel_multiply splits the
+bigger operand into chunks, multiplies each chunk by the other
+operand in a separate process, and then adds up the partial
+products.
+
+    p = parallel_multiply(q, r, workers=4)
+    assert p == q * r
+
+Sending _Term objects between processes would be slow, so we
+encode each polynomial as a list of variable names plus a list of
+(exponents, coeff) pairs, where exponents is a tuple with one
+entry per variable.  Multiplying two monomials is then just adding
+two tuples of integers.
+
+The worker processes do their arithmetic with the ring of the
+polynomials (see Poly.ring), so this works for any handler that can
+be pickled, and the results are identical to Poly.multiply_polys.
+"""
+
+PARALLEL_THRESHOLD = 250_000
+
+
+def decode(var_names, products):
+    coeffs_by_key = {}
+    for exponents, coeff in products.items():
+        key = tuple(
+            (var_name, exponent)
+            for var_name, exponent in zip(var_names, exponents)
+            if exponent
+        )
+        coeffs_by_key[key] = coeff
+    return coeffs_by_key
+
+
+def encode(p, var_names):
+    """
+    This turns p into a list of (exponents, coeff) pairs, where
+    exponents lines up with var_names.
+    """
+    var_index = {var_name: i for i, var_name in enumerate(var_names)}
+    encoded = []
+    for term in p.terms:
+        exponents = [0] * len(var_names)
+        for var_name, exponent in term.key:
+            exponents[var_index[var_name]] = exponent
+        encoded.append((tuple(exponents), term.coeff))
+    return encoded
+
+
+def multiply_chunk(handler, chunk, other):
+    """
+    This runs in a worker process.  It returns a dict that maps
+    exponent tuples to coefficients for chunk * other.
+    """
+    products = {}
+    add = operator.add
+    for exponents1, coeff1 in chunk:
+        for exponents2, coeff2 in other:
+            exponents = tuple(map(add, exponents1, exponents2))
+            coeff = handler.mul(coeff1, coeff2)
+            if exponents in products:
+                products[exponents] = handler.add(products[exponents], coeff)
+            else:
+                products[exponents] = coeff
+    return products
+
+
+def parallel_multiply(poly1, poly2, workers=None, threshold=PARALLEL_THRESHOLD):
+    """
+    If len(poly1) * len(poly2) is below the threshold, the overhead
+    of starting processes isn't worth it, and we just call
+    Poly.multiply_polys.
+
+    The workers argument gets passed along to ProcessPoolExecutor
+    (None means one process per CPU).
+    """
+    enforce_type(poly1, Poly)
+    enforce_type(poly2, Poly)
+    enforce_type(threshold, int)
+
+    if len(poly1.terms) * len(poly2.terms) < threshold:
+        return Poly.multiply_polys(poly1, poly2)
+
+    if len(poly1.terms) < len(poly2.terms):
+        poly1, poly2 = poly2, poly1
+
+    Math = poly1.ring
+    if poly2.ring != Math:
+        raise ValueError("We cannot mix polynomials from different rings.")
+    var_names = sorted(poly1.variables() | poly2.variables())
+    encoded1 = encode(poly1, var_names)
+    encoded2 = encode(poly2, var_names)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    """
+    We use a few chunks per process, so that one slow chunk
+    doesn't leave the other processes idle.
+    """
+    num_chunks = 4 * workers
+    chunk_size = max(1, -(-len(encoded1) // num_chunks))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                multiply_chunk, Math, encoded1[i : i + chunk_size], encoded2
+            )
+            for i in range(0, len(encoded1), chunk_size)
+        ]
+
+        products = {}
+        for future in futures:
+            for exponents, coeff in future.result().items():
+                if exponents in products:
+                    products[exponents] = Math.add(products[exponents], coeff)
+                else:
+                    products[exponents] = coeff
+
+    with poly.using_math(Math):
+        return Poly.from_key_dict(decode(var_names, products))
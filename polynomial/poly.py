@@ -1,5 +1,14 @@
 import collections
-from . import integer_math
+import contextlib
+import contextvars
+import functools
+import heapq
+import math
+import operator
+import re
+import time
+import weakref
+from . import fraction_math, integer_math, modulus_math
 
 """
 The Poly class allows you to create polynomial expressions
@@ -68,7 +77,78 @@ Useful references:
       ring with a multiplicative identity, which we call "one".
 """
 
-Math = integer_math.IntegerMath
+_math_var = contextvars.ContextVar("Math", default=integer_math.IntegerMath)
+
+
+class _ContextMath:
+    """
+    The rest of this module calls things like Math.add without
+    worrying about which handler is in effect.  Math is an instance
+    of this class, and it forwards everything to the handler for the
+    current context (see set_math and Poly.ring).
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(_math_var.get(), name)
+
+    # The properties below are just a faster path for the attributes
+    # that we use the most.
+
+    @property
+    def add(self):
+        return _math_var.get().add
+
+    @property
+    def coeff_str(self):
+        return _math_var.get().coeff_str
+
+    @property
+    def dot(self):
+        return getattr(_math_var.get(), "dot", None)
+
+    @property
+    def mul(self):
+        return _math_var.get().mul
+
+    @property
+    def mul_many(self):
+        return getattr(_math_var.get(), "mul_many", None)
+
+    @property
+    def negate(self):
+        return _math_var.get().negate
+
+    @property
+    def one(self):
+        return _math_var.get().one
+
+    @property
+    def power(self):
+        return _math_var.get().power
+
+    @property
+    def sum_many(self):
+        return getattr(_math_var.get(), "sum_many", None)
+
+    @property
+    def value_type(self):
+        return _math_var.get().value_type
+
+    @property
+    def zero(self):
+        return _math_var.get().zero
+
+
+Math = _ContextMath()
+trusted_mode = False
+
+"""
+See Poly.prefers_multinomial_expansion.
+"""
+MULTINOMIAL_TERM_LIMIT = 16
+_active_profile = None
 
 
 def set_math(handler):
@@ -85,9 +165,395 @@ def set_math(handler):
     Multiplication should have a one-like value such a * Math.one == a.
 
     Multiplication should also be distributive with respect to addition.
+
+    Also, coeff_str should give the same string for two values exactly
+    when they are equal, since that is how we compare polynomials.  If
+    you want to put polynomials in sets or dicts, the values need to be
+    hashable, too (see Poly.__hash__).
+
+    A handler may also provide bulk operations, which let it do a
+    whole batch of arithmetic at once (for example, with a single
+    reduction modulo n at the end):
+
+        sum_many(values) - the sum of a list of values
+        dot(coeffs, values) - the sum of coeffs[i] * values[i]
+        mul_many(values) - the product of a list of values
+
+    These are optional; see math_sum_many and friends for how we
+    fall back to add and mul.
+
+    The handler is context-local (it lives in a ContextVar), so each
+    thread, and each asyncio task, can work with its own handler.
+    (New threads start with IntegerMath.)  Also, each Poly remembers
+    the handler that it was built with (see Poly.ring), and all of
+    its operations use that handler, no matter what set_math says
+    later on.  So set_math really just picks the handler for new
+    polynomials, such as the ones from Poly.var and Poly.constant.
+    """
+    _math_var.set(handler)
+
+
+def get_math():
+    """
+    This returns the actual handler for the current context.
+    (Math itself is just a stand-in that forwards to it.)
+    """
+    return _math_var.get()
+
+
+def _local_math():
+    """
+    Every Math.mul goes through the ContextVar, so our inner loops
+    look up the handler once and bind it to a local named Math.
+    While we are profiling, we return the counting stand-in instead,
+    so that those loops still get counted.
+    """
+    if _active_profile is not None:
+        return Math
+    return _math_var.get()
+
+
+@contextlib.contextmanager
+def using_math(handler):
     """
-    global Math
-    Math = handler
+    This is like set_math, but it only lasts until the end of
+    the block:
+
+        with using_math(ModulusMath(7)):
+            x = Poly.var("x")
+    """
+    token = _math_var.set(handler)
+    try:
+        yield handler
+    finally:
+        _math_var.reset(token)
+
+
+"""
+The ring helpers below look for arguments whose type is in
+_RING_TYPES.  That is just Poly (see the bottom of this file), plus
+DensePoly, which adds itself so that dense.py can use _in_ring, too.
+"""
+_RING_TYPES = set()
+
+
+def _ring_of(args):
+    """
+    This returns the ring of the polynomial arguments of an
+    operation, or None if there are none.  We refuse to mix
+    polynomials from different rings; use Poly.to_ring to convert
+    one of them.
+    """
+    ring = None
+    for arg in args:
+        if type(arg) in _RING_TYPES:
+            if ring is None:
+                ring = arg.ring
+            elif arg.ring is not ring and arg.ring != ring:
+                raise ValueError(
+                    f"We cannot mix polynomials over {ring} and {arg.ring}."
+                )
+    return ring
+
+
+def _has_faithful_hashes(ring):
+    """
+    See Poly.__hash__.
+    """
+    return (
+        ring is integer_math.IntegerMath
+        or ring is fraction_math.FractionMath
+        or type(ring) is modulus_math.ModulusMath
+    )
+
+
+def _in_ring(f):
+    """
+    This makes f do its arithmetic in the ring of its polynomial
+    arguments (see Poly.ring), no matter which handler the caller's
+    context is using.  We only touch the ContextVar if we need
+    to switch handlers.
+    """
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        """
+        This is on the path of every operation, so we inline the
+        common case of _ring_of, where all of the rings are the
+        same object.
+        """
+        ring = None
+        for arg in args:
+            if type(arg) in _RING_TYPES:
+                if ring is None:
+                    ring = arg.ring
+                elif arg.ring is not ring:
+                    ring = _ring_of(args)
+                    break
+        if ring is None or _math_var.get() is ring:
+            return f(*args, **kwargs)
+        token = _math_var.set(ring)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            _math_var.reset(token)
+
+    return wrapper
+
+
+def _in_ring_generator(f):
+    """
+    This is like _in_ring, but for generators.  We can't leave the
+    ring in effect while the caller has control between items, so
+    we switch to it each time we resume the generator.
+    """
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        ring = _ring_of(args) or _math_var.get()
+        token = _math_var.set(ring)
+        try:
+            generator = f(*args, **kwargs)
+        finally:
+            _math_var.reset(token)
+        while True:
+            token = _math_var.set(ring)
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                _math_var.reset(token)
+            yield item
+
+    return wrapper
+
+
+def set_trusted_mode(trusted):
+    """
+    By default we check types (and other invariants) all over the
+    place, including every time we construct a _VarPower or _Term.
+    That is great for catching mistakes, but most of those checks
+    are on objects that we built ourselves from already-checked
+    objects.
+
+    In trusted mode we still validate everything that comes in
+    through the public entry points (Poly.var, Poly.constant,
+    eval, apply, substitute, and friends), but we skip the checks
+    on the internal construction of terms and polynomials.
+
+    The inner loops of our big operations, such as multiplying
+    two long polynomials, don't check each coefficient anyway, so
+    trusted mode mostly pays off when you do lots of small
+    operations (see benchmarks/trusted_mode.py).
+
+    Note that the Math handlers do their own checking with assert
+    statements; run Python with -O if you want to skip those too.
+    """
+    global trusted_mode
+    enforce_type(trusted, bool)
+    trusted_mode = trusted
+
+
+def set_substitution_cache_size(max_size):
+    """
+    If you substitute the same polynomial into the same polynomial
+    over and over (for example, in a long pipeline of compositions),
+    you can have Poly.substitute remember its most recent results.
+    The cache is off (max_size == 0) by default.
+    """
+    enforce_type(max_size, int)
+    _substitution_cache.resize(max_size)
+
+
+def math_from_int(n, handler=None):
+    """
+    This turns a non-negative Python integer into a value of the
+    Math type.  We use the convert method of the handler (see
+    Poly.to_ring) if it has one.  Otherwise we add up powers of two,
+    starting from one, which works in any ring.
+    """
+    if handler is None:
+        handler = Math
+    convert = getattr(handler, "convert", None)
+    if convert is not None:
+        return convert(n)
+    result = handler.zero
+    power = handler.one
+    while n:
+        if n & 1:
+            result = handler.add(result, power)
+        n >>= 1
+        if n:
+            power = handler.add(power, power)
+    return result
+
+
+"""
+The helpers math_dot, math_mul_many, and math_sum_many use the bulk
+operations of the Math handler (see set_math) if it has them, and
+otherwise they just make one call to add or mul at a time.  The
+handler defaults to Math.  Pass in lists, not iterators.
+"""
+
+
+def math_dot(coeffs, values, handler=None):
+    if handler is None:
+        handler = Math
+    dot = handler.dot if handler is Math else getattr(handler, "dot", None)
+    if dot is not None:
+        return dot(coeffs, values)
+    result = handler.zero
+    for coeff, value in zip(coeffs, values):
+        result = handler.add(result, handler.mul(coeff, value))
+    return result
+
+
+def math_mul_many(values, handler=None):
+    if handler is None:
+        handler = Math
+    mul_many = (
+        handler.mul_many if handler is Math else getattr(handler, "mul_many", None)
+    )
+    if mul_many is not None:
+        return mul_many(values)
+    result = handler.one
+    for value in values:
+        result = handler.mul(result, value)
+    return result
+
+
+def math_sum_many(values, handler=None):
+    if handler is None:
+        handler = Math
+    sum_many = (
+        handler.sum_many if handler is Math else getattr(handler, "sum_many", None)
+    )
+    if sum_many is not None:
+        return sum_many(values)
+    result = handler.zero
+    for value in values:
+        result = handler.add(result, value)
+    return result
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    This counts and times the work that goes on inside of Poly
+    while the block runs:
+
+        with profile() as stats:
+            p = (x + y + 1) ** 20
+        print(stats.report())
+        json.dump(stats.as_dict(), f)
+
+    We count the calls to Math.add, Math.mul, Math.power, and
+    Math.negate, the _Term constructions, the calls to simplify
+    (along with how many like terms landed in each bucket), the
+    calls to sort terms, and the sizes of all the Poly objects
+    that get built.
+
+    Most terms share an interned monomial, so they come from
+    _Term.with_coeff (often by way of _Term.from_key), and
+    _Term.__init__ only runs for terms that we build from scratch,
+    such as the first term that we see with each monomial.  So the
+    count for _Term.__init__ drops when you run the same
+    computation again, but the count for _Term.with_coeff doesn't.
+
+    We do this by swapping in wrapped versions of those functions
+    (and a counting proxy for Math) when the block starts, and
+    putting the originals back when it ends, so the normal code
+    paths don't pay anything when nobody is profiling.
+
+    Unlike set_math, profiling is not context-local.  We patch the
+    classes themselves, so while the block runs we count the work
+    in every thread and task, and only one profile can be active at
+    a time.
+
+    The times are inclusive, so the time for Poly.__init__ also
+    counts the simplify and sort calls that it makes.  The counting
+    itself is slow, so compare the counts rather than the absolute
+    times with an un-profiled run.
+    """
+    global Math, _active_profile
+    if _active_profile is not None:
+        raise ValueError("We are already profiling.")
+
+    stats = ProfileStats()
+    context_math = Math
+    originals = [
+        (_Term, "__init__", _Term.__dict__["__init__"]),
+        (_Term, "with_coeff", _Term.__dict__["with_coeff"]),
+        (_Term, "from_key", _Term.__dict__["from_key"]),
+        (Poly, "__init__", Poly.__dict__["__init__"]),
+        (Poly, "simplify", Poly.__dict__["simplify"]),
+        (Poly, "put_terms_in_order", Poly.__dict__["put_terms_in_order"]),
+        (Poly, "_from_ordered_terms", Poly.__dict__["_from_ordered_terms"]),
+        (Poly, "_from_simplified_terms", Poly.__dict__["_from_simplified_terms"]),
+    ]
+
+    def timed(name, f):
+        def wrapper(*args):
+            start = time.perf_counter()
+            try:
+                return f(*args)
+            finally:
+                stats.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    term_init = timed("_Term.__init__", _Term.__init__)
+    with_coeff = timed("_Term.with_coeff", _Term.with_coeff)
+    from_key = timed("_Term.from_key", _Term.from_key)
+    simplify = timed("Poly.simplify", Poly.simplify)
+    put_terms_in_order = timed("Poly.put_terms_in_order", Poly.put_terms_in_order)
+    poly_init = timed("Poly.__init__", Poly.__init__)
+    from_ordered_terms = timed("Poly._from_ordered_terms", Poly._from_ordered_terms)
+    from_simplified_terms = timed(
+        "Poly._from_simplified_terms", Poly._from_simplified_terms
+    )
+
+    def counting_simplify(self):
+        for size in collections.Counter(term.key for term in self.terms).values():
+            stats.bucket_sizes[size] += 1
+        simplify(self)
+
+    def counting_put_terms_in_order(self):
+        stats.sort_sizes[len(self.terms)] += 1
+        put_terms_in_order(self)
+
+    def counting_poly_init(self, terms):
+        poly_init(self, terms)
+        stats.poly_sizes[len(self.terms)] += 1
+
+    def counting_from_ordered_terms(terms):
+        poly = from_ordered_terms(terms)
+        stats.poly_sizes[len(poly.terms)] += 1
+        return poly
+
+    def counting_from_simplified_terms(terms):
+        poly = from_simplified_terms(terms)
+        stats.poly_sizes[len(poly.terms)] += 1
+        return poly
+
+    _Term.__init__ = term_init
+    _Term.with_coeff = with_coeff
+    _Term.from_key = staticmethod(from_key)
+    Poly.__init__ = counting_poly_init
+    Poly.simplify = counting_simplify
+    Poly.put_terms_in_order = counting_put_terms_in_order
+    Poly._from_ordered_terms = staticmethod(counting_from_ordered_terms)
+    Poly._from_simplified_terms = staticmethod(counting_from_simplified_terms)
+    Math = _CountingMath(timed)
+    _active_profile = stats
+    try:
+        yield stats
+    finally:
+        for cls, name, original in originals:
+            setattr(cls, name, original)
+        Math = context_math
+        _active_profile = None
 
 
 def enforce_dict_types(dct, key_type, value_type):
@@ -126,6 +592,279 @@ def enforce_type(var, _type):
         raise TypeError(f"{var} is not type {_type}")
 
 
+def _generate_python_evaluator(plan, var_names, needed_exponents):
+    """
+    This is a helper for Poly.compile.  It writes a straight-line
+    Python function such as
+
+        def evaluate(v0, v1):
+            v0_1 = one * v0
+            v0_2 = v0_1 * v0
+            v1_1 = one * v1
+            result = zero
+            result += c0 * v0_2 * v1_1
+            result += c1
+            return result
+
+    Coefficients get passed in through the globals of the function,
+    so we never have to worry about how they print.
+    """
+    if get_math() not in (integer_math.IntegerMath, fraction_math.FractionMath):
+        raise ValueError("We can only generate code for IntegerMath or FractionMath.")
+
+    params = [f"v{i}" for i in range(len(var_names))]
+    lines = [f"def evaluate({', '.join(params)}):"]
+
+    for i, exponents in enumerate(needed_exponents):
+        prev_exponent = 0
+        for exponent in exponents:
+            gap = exponent - prev_exponent
+            if prev_exponent == 0:
+                base = "one"
+            else:
+                base = f"v{i}_{prev_exponent}"
+            factor = f"v{i}" if gap == 1 else f"v{i} ** {gap}"
+            lines.append(f"    v{i}_{exponent} = {base} * {factor}")
+            prev_exponent = exponent
+
+    namespace = dict(zero=Math.zero, one=Math.one)
+    lines.append("    result = zero")
+    for n, (coeff, factors) in enumerate(plan):
+        namespace[f"c{n}"] = coeff
+        product = "".join(f" * v{i}_{exponent}" for i, exponent in factors)
+        lines.append(f"    result += c{n}{product}")
+    lines.append("    return result")
+
+    code = compile("\n".join(lines), "<Poly.compile>", "exec")
+    exec(code, namespace)
+    return namespace["evaluate"]
+
+
+class _InternTable:
+    """
+    An intern table makes sure that we only keep one copy of
+    equivalent immutable objects such as (x**3).  If a caller asks
+    for an object that we already have, we return the existing
+    object, so nobody needs to construct (or validate) a duplicate.
+
+    We only hold weak references, so the table never keeps an
+    object alive on its own, and we stop adding new entries
+    once we reach max_size.
+
+    We count hits and misses; see interning_stats.
+    """
+
+    def __init__(self, max_size):
+        self.table = weakref.WeakValueDictionary()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, key, obj):
+        if len(self.table) < self.max_size:
+            self.table[key] = obj
+
+    def lookup(self, key):
+        obj = self.table.get(key)
+        if obj is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return obj
+
+    def stats(self):
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self.table),
+            max_size=self.max_size,
+        )
+
+
+class _LRUCache:
+    """
+    This is a simple least-recently-used cache.  Unlike
+    functools.lru_cache, it can be resized (or turned off) while
+    the program is running.
+    """
+
+    def __init__(self, max_size):
+        self.entries = collections.OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def lookup(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def resize(self, max_size):
+        self.max_size = max_size
+        while len(self.entries) > max(max_size, 0):
+            self.entries.popitem(last=False)
+
+
+class _CountingMath:
+    """
+    This stands in for Math while we are profiling (see profile).
+    Like Math, it forwards everything to the handler for the current
+    context, but it counts and times the arithmetic.
+    """
+
+    COUNTED = ["add", "dot", "mul", "mul_many", "negate", "power", "sum_many"]
+
+    def __init__(self, timed):
+        self.timed = timed
+        self.wrappers = {}
+
+    def __getattr__(self, name):
+        handler = _math_var.get()
+        if name not in _CountingMath.COUNTED:
+            return getattr(handler, name)
+        f = getattr(handler, name, None)
+        if f is None:
+            return None
+        key = (id(handler), name)
+        if key not in self.wrappers:
+            self.wrappers[key] = (f, self.timed(f"Math.{name}", f))
+        return self.wrappers[key][1]
+
+
+class ProfileStats:
+    """
+    This is what profile gives you.  The counts and times (in
+    seconds) are keyed on the name of the operation, such as
+    "Math.mul" or "_Term.__init__".  The histograms map a size
+    to the number of times that we saw it:
+
+        bucket_sizes - how many like terms simplify combined at once
+        sort_sizes - how many terms we sorted at once
+        poly_sizes - how many terms each new Poly ended up with
+    """
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.times = collections.defaultdict(float)
+        self.bucket_sizes = collections.Counter()
+        self.sort_sizes = collections.Counter()
+        self.poly_sizes = collections.Counter()
+
+    def as_dict(self):
+        """
+        This is plain data, so you can pass it to json.dump.
+        """
+        return dict(
+            operations={
+                name: dict(count=self.counts[name], seconds=self.times[name])
+                for name in sorted(self.counts)
+            },
+            bucket_sizes=dict(sorted(self.bucket_sizes.items())),
+            sort_sizes=dict(sorted(self.sort_sizes.items())),
+            poly_sizes=dict(sorted(self.poly_sizes.items())),
+        )
+
+    def record(self, name, elapsed):
+        self.counts[name] += 1
+        self.times[name] += elapsed
+
+    def report(self):
+        lines = []
+        for name in sorted(self.counts, key=lambda name: -self.times[name]):
+            lines.append(
+                f"{name:30} {self.counts[name]:10} calls {self.times[name]:10.4f}s"
+            )
+        return "\n".join(lines)
+
+
+_var_power_table = _InternTable(max_size=100_000)
+_monomial_table = _InternTable(max_size=100_000)
+_substitution_cache = _LRUCache(max_size=0)
+
+
+"""
+These remember the pieces of our sort keys (see order_key).  Like
+the intern tables, they stop growing once they reach their max
+size, so a program that makes up lots of variable names can't make
+them grow forever.
+"""
+_ORDER_CACHE_SIZE = 100_000
+_var_name_ranks = {}
+_order_pairs = {}
+
+"""
+This matches one factor of a term in our canonical string format
+(see Poly.parse), such as "(x**3)", "x", "(-18)", "9", or "1/3".
+"""
+_factor_pattern = re.compile(
+    r"\((?P<var_name>[^\W\d]\w*)\*\*(?P<exponent>\d+)\)"
+    r"|(?P<var>[^\W\d]\w*)"
+    r"|\((?P<negative>-[\d/]+)\)"
+    r"|(?P<positive>[\d/]+)"
+)
+
+
+def order_key(key):
+    """
+    This turns a monomial key (see _Term) into a sort key, such that
+    sorting terms by descending sort key puts them in our canonical
+    order (see Poly.put_terms_in_order).
+
+    The canonical order compares exponents of variables in
+    alphabetical order, and we want the sort key to work without
+    knowing which other variables are in play.  If two monomials have
+    the same exponents up to some variable v, and only one of them
+    includes v, that one goes first.  So in the sort key, variables
+    that come EARLIER in the alphabet need to compare as BIGGER.  We
+    get that by negating the character codes, and we add a 1 at the
+    end, so that "x" beats "xy" (since "x" < "xy").
+
+    So the sort key for x*(y**3) is (((-120, 1), 1), ((-121, 1), 3)).
+
+    There aren't many distinct (var_name, exponent) pairs, even in
+    huge polynomials, so we share the pieces of the sort key (up to
+    _ORDER_CACHE_SIZE of them).
+    """
+    result = []
+    for pair in key:
+        order_pair = _order_pairs.get(pair)
+        if order_pair is None:
+            var_name, exponent = pair
+            rank = _var_name_ranks.get(var_name)
+            if rank is None:
+                rank = tuple(-ord(c) for c in var_name) + (1,)
+                if len(_var_name_ranks) < _ORDER_CACHE_SIZE:
+                    _var_name_ranks[var_name] = rank
+            order_pair = (rank, exponent)
+            if len(_order_pairs) < _ORDER_CACHE_SIZE:
+                _order_pairs[pair] = order_pair
+        result.append(order_pair)
+    return tuple(result)
+
+
+def interning_stats():
+    """
+    This reports how well our intern tables are working.  See
+    _VarPower.make and _Term.from_key.
+    """
+    return dict(
+        var_powers=_var_power_table.stats(),
+        monomials=_monomial_table.stats(),
+    )
+
+
 class _VarPower:
     """
     This helper class represents a simple power of a variable
@@ -136,33 +875,60 @@ class _VarPower:
 
     You never want to use this class directly; go through Poly
     instead.
+
+    Use _VarPower.make rather than the constructor, so that
+    identical var-powers can share a single object.
+
+    We use __slots__ to keep these small.  (The __weakref__ slot
+    lets our intern table refer to us.)  Our key is the pair
+    (var_name, exponent), and the keys of terms share it.
     """
 
+    __slots__ = ("var_name", "exponent", "key", "__weakref__")
+
     def __init__(self, var_name, exponent):
-        enforce_legal_variable_name(var_name)
+        if not trusted_mode:
+            enforce_legal_variable_name(var_name)
 
-        # We only handle positive powers of variables.
-        # Constant values are handled by _Term.
-        enforce_type(exponent, int)
-        if exponent <= 0:
-            raise ValueError("{exponent} is not positive")
+            # We only handle positive powers of variables.
+            # Constant values are handled by _Term.
+            enforce_type(exponent, int)
+            if exponent <= 0:
+                raise ValueError("{exponent} is not positive")
 
         self.var_name = var_name
         self.exponent = exponent
-        self.sig = self.signature()
+        self.key = (var_name, exponent)
 
     def __str__(self):
         return self.sig
 
     def compute_power(self, x):
-        enforce_type(x, Math.value_type)
+        if not trusted_mode:
+            enforce_type(x, Math.value_type)
         return Math.power(x, self.exponent)
 
+    @property
+    def sig(self):
+        """
+        We only build this string when somebody wants to print us.
+        """
+        return self.signature()
+
     def signature(self):
         if self.exponent == Math.one:
             return self.var_name
         return f"({self.var_name}**{self.exponent})"
 
+    @staticmethod
+    def make(var_name, exponent):
+        key = (var_name, exponent)
+        vp = _var_power_table.lookup(key)
+        if vp is None:
+            vp = _VarPower(var_name, exponent)
+            _var_power_table.add(vp.key, vp)
+        return vp
+
 
 class _Term:
     """
@@ -175,30 +941,56 @@ class _Term:
     _Term.constant, _Term.one, and _Term.zero.
 
     Our basic data structure simply stores a coefficient
-    (abbreviated as "coeff") and a list of VarPowers.
+    (abbreviated as "coeff") and a tuple of VarPowers.
+
+    We also keep a "key" that identifies our monomial.  The key is
+    just a tuple of (var_name, exponent) pairs in var_name order,
+    such as (("x", 3), ("y", 3)), so it is cheap to build, hash,
+    and compare.  Two terms can only be combined if they have the
+    same key.
+
+    The "sig" is the string form of the key, such as "(x**3)*(y**3)".
+    We only compute it when we are printing the term.  Likewise,
+    var_dict and var_names get computed from the key when somebody
+    asks for them.
 
-    We also keep a dictionary keyed on var names for quick lookups,
-    as well as a "sig" that represents the signature of our term.
-    Two terms can only be combined if they have the same sig.
+    Big expansions have millions of terms, so we use __slots__, and
+    terms with the same monomial share all of their fields except
+    for coeff (see from_key and with_coeff).
 
     The Poly class often directly inspects the _Term objects,
     so consider the names of _Term's fields to be part of its API.
     """
 
+    __slots__ = ("coeff", "var_powers", "key", "order_key", "monomial", "__weakref__")
+
     def __init__(self, coeff, var_powers):
-        enforce_type(coeff, Math.value_type)
+        if not trusted_mode:
+            enforce_type(coeff, Math.value_type)
 
-        enforce_list_element_types(var_powers, _VarPower)
+            enforce_list_element_types(var_powers, _VarPower)
 
-        var_names = [vp.var_name for vp in var_powers]
-        enforce_sorted_distinct_list(var_names)
+            var_names = [vp.var_name for vp in var_powers]
+            enforce_sorted_distinct_list(var_names)
 
-        self.var_powers = var_powers
+        self.var_powers = tuple(var_powers)
         self.coeff = coeff
 
-        self.sig = "*".join(vp.sig for vp in var_powers)
-        self.var_dict = {vp.var_name: vp.exponent for vp in var_powers}
-        self.var_names = set(self.var_dict.keys())
+        self.key = tuple(vp.key for vp in var_powers)
+        self.order_key = order_key(self.key)
+        self.monomial = None
+
+    @property
+    def sig(self):
+        return "*".join(vp.sig for vp in self.var_powers)
+
+    @property
+    def var_dict(self):
+        return dict(self.key)
+
+    @property
+    def var_names(self):
+        return {var_name for var_name, _ in self.key}
 
     def apply(self, **var_assignments):
         """
@@ -211,25 +1003,27 @@ class _Term:
         If none of the vars are in our term, then we just
         return ourself.  See Poly.apply for more context.
         """
-        enforce_dict_types(var_assignments, str, Math.value_type)
+        if not trusted_mode:
+            enforce_dict_types(var_assignments, str, Math.value_type)
 
-        if not set(var_assignments) & set(self.var_dict):
+        if not any(var_name in var_assignments for var_name, _ in self.key):
             return self
 
         new_coeff = self.coeff
-        new_vps = []
+        new_key = []
         for vp in self.var_powers:
             if vp.var_name in var_assignments:
                 value = var_assignments[vp.var_name]
                 new_coeff = Math.mul(new_coeff, vp.compute_power(value))
             else:
-                new_vps.append(vp)
-        return _Term(new_coeff, new_vps)
+                new_key.append((vp.var_name, vp.exponent))
+        return _Term.from_key(new_coeff, tuple(new_key))
 
     def canonicalized_string(self):
         """
         An example string is "60*x*(y**22)".
         """
+        Math = _local_math()
         coeff_str = Math.coeff_str(self.coeff)
 
         if self.is_constant():
@@ -242,8 +1036,12 @@ class _Term:
         """
         For t == 5*(x**2)*(z**11), t.degree_of_var("z") = 11
         """
-        enforce_type(var_name, str)
-        return self.var_dict.get(var_name, 0)
+        if not trusted_mode:
+            enforce_type(var_name, str)
+        for name, exponent in self.key:
+            if name == var_name:
+                return exponent
+        return 0
 
     def eval(self, **var_assignments):
         """
@@ -255,16 +1053,29 @@ class _Term:
         to check each of its terms to see which variables
         are used.)
         """
-        enforce_dict_types(var_assignments, str, Math.value_type)
+        Math = _local_math()
+        if not trusted_mode:
+            enforce_dict_types(var_assignments, str, Math.value_type)
 
-        for var_name in self.var_names:
+        for var_name, _ in self.key:
             if var_name not in var_assignments:
                 raise ValueError(f"You are not providing an assignment for {var_name}.")
 
-        product = Math.one
-        for vp in self.var_powers:
-            product = Math.mul(product, vp.compute_power(var_assignments[vp.var_name]))
-        return Math.mul(self.coeff, product)
+        return self.evaluate(var_assignments, Math)
+
+    def evaluate(self, var_assignments, handler):
+        """
+        This is eval without any checks, for callers (like Poly.eval)
+        that have already checked the assignments and looked up the
+        Math handler.  A missing variable raises KeyError.
+        """
+        product = self.coeff
+        for var_name, exponent in self.key:
+            value = var_assignments[var_name]
+            if exponent != 1:
+                value = handler.power(value, exponent)
+            product = handler.mul(product, value)
+        return product
 
     def factorize_on_var(self, substituted_var):
         """
@@ -273,12 +1084,31 @@ class _Term:
         basically splits out the non-substituted portion of the term,
         and reports the power of the substituted variable.
         """
-        if substituted_var not in self.var_dict:
+        power_of_substituted_var = self.degree_of_var(substituted_var)
+        if power_of_substituted_var == 0:
             return (self, 0)
 
-        var_powers = [vp for vp in self.var_powers if vp.var_name != substituted_var]
-        power_of_substituted_var = self.var_dict[substituted_var]
-        return (_Term(self.coeff, var_powers), power_of_substituted_var)
+        key = tuple(pair for pair in self.key if pair[0] != substituted_var)
+        return (_Term.from_key(self.coeff, key), power_of_substituted_var)
+
+    def factorize_on_vars(self, substituted_vars):
+        """
+        This is like factorize_on_var, except that we split out
+        several variables at once.  We return the non-substituted
+        portion of the term, plus a key (see _Term.key) for the
+        substituted portion.
+        """
+        if not any(var_name in substituted_vars for var_name, _ in self.key):
+            return (self, ())
+
+        key = []
+        substituted_key = []
+        for pair in self.key:
+            if pair[0] in substituted_vars:
+                substituted_key.append(pair)
+            else:
+                key.append(pair)
+        return (_Term.from_key(self.coeff, tuple(key)), tuple(substituted_key))
 
     def is_constant(self):
         """
@@ -287,15 +1117,17 @@ class _Term:
         return len(self.var_powers) == 0
 
     def is_one(self):
-        return self.coeff == Math.one and len(self.var_powers) == 0
+        return len(self.var_powers) == 0 and self.coeff == Math.one
 
     def multiply_by_constant(self, c):
-        enforce_type(c, Math.value_type)
+        Math = _local_math()
+        if not trusted_mode:
+            enforce_type(c, Math.value_type)
         if c == Math.zero:
             return _Term.zero()
         if c == Math.one:
             return self
-        return _Term(Math.mul(c, self.coeff), self.var_powers)
+        return self.with_coeff(Math.mul(c, self.coeff))
 
     def multiply_with(self, other):
         """
@@ -313,7 +1145,7 @@ class _Term:
         raise TypeError("We don't support this type of multiplication.")
 
     def negate(self):
-        return _Term(Math.negate(self.coeff), self.var_powers)
+        return self.with_coeff(Math.negate(self.coeff))
 
     def raised_to_exponent(self, exponent):
         """
@@ -324,9 +1156,10 @@ class _Term:
         repeated multiplication, so we expect non-negative exponents,
         and we expect our Math class to respect those semantics.
         """
-        enforce_type(exponent, int)
-        if exponent < 0:
-            raise ValueError("We do not support negative exponentiation yet.")
+        if not trusted_mode:
+            enforce_type(exponent, int)
+            if exponent < 0:
+                raise ValueError("We do not support negative exponentiation yet.")
 
         if exponent == 0:
             return _Term.one()
@@ -335,8 +1168,8 @@ class _Term:
             return self
 
         coeff = Math.power(self.coeff, exponent)
-        vps = [_VarPower(vp.var_name, vp.exponent * exponent) for vp in self.var_powers]
-        return _Term(coeff, vps)
+        key = tuple((var_name, power * exponent) for var_name, power in self.key)
+        return _Term.from_key(coeff, key)
 
     def sort_key(self, var_names):
         """
@@ -344,22 +1177,62 @@ class _Term:
         school algebra format.  The var_names list comes from our
         parent Poly.  See Poly.put_terms_in_order for more context.
         """
-        enforce_list_element_types(var_names, str)
-
-        def exponent(var_name):
-            return self.var_dict.get(var_name, 0)
+        if not trusted_mode:
+            enforce_list_element_types(var_names, str)
 
-        return tuple(exponent(var_name) for var_name in var_names)
+        var_dict = self.var_dict
+        return tuple(var_dict.get(var_name, 0) for var_name in var_names)
 
     def transform_coefficient(self, f):
         assert callable(f)
-        return _Term(f(self.coeff), self.var_powers)
+        return self.with_coeff(f(self.coeff))
+
+    def with_coeff(self, coeff):
+        """
+        This returns a term with the same monomial as ours, but with
+        a new coefficient.  The new term shares all of our monomial
+        data, which is safe because terms are immutable.
+        """
+        if not trusted_mode:
+            enforce_type(coeff, _math_var.get().value_type)
+        term = _Term.__new__(_Term)
+        term.coeff = coeff
+        term.var_powers = self.var_powers
+        term.key = self.key
+        term.order_key = self.order_key
+        term.monomial = self.monomial
+        return term
 
     @staticmethod
     def constant(c):
-        enforce_type(c, Math.value_type)
+        if not trusted_mode:
+            enforce_type(c, Math.value_type)
         return _Term(c, [])
 
+    @staticmethod
+    def from_key(coeff, key):
+        """
+        This is the inverse of _Term.key.
+
+        We intern one term with a coefficient of one for each monomial,
+        and then every term that we build with that monomial shares
+        its var_powers, key, and so on.  That saves both memory and
+        the time to build and validate the _VarPower objects.  (The
+        key that you pass in is just used for the lookup, so keys
+        from places like multiply_keys are still separate tuples.)
+
+        Each term points back to its interned monomial (see the
+        "monomial" field), which keeps the monomial alive in our
+        weak table for as long as anybody is using it.
+        """
+        monomial = _monomial_table.lookup(key)
+        if monomial is None:
+            vps = [_VarPower.make(var_name, exponent) for var_name, exponent in key]
+            monomial = _Term(Math.one, vps)
+            monomial.monomial = monomial
+            _monomial_table.add(monomial.key, monomial)
+        return monomial.with_coeff(coeff)
+
     @staticmethod
     def multiply_terms(term1, term2):
         """
@@ -372,6 +1245,7 @@ class _Term:
         For the VarPower pieces, we use a dict to collect common
         variables.
         """
+        Math = _local_math()
         if term1.coeff == Math.zero or term2.coeff == Math.zero:
             return _Term.zero()
         elif term1.is_one():
@@ -380,15 +1254,23 @@ class _Term:
             return term1
 
         coeff = Math.mul(term1.coeff, term2.coeff)
-        exponents = collections.defaultdict(int)
-        for vp in term1.var_powers:
-            exponents[vp.var_name] = vp.exponent
-        for vp in term2.var_powers:
-            exponents[vp.var_name] += vp.exponent
-        parms = list(exponents.items())
-        parms.sort()
-        vps = [_VarPower(var, exponent) for var, exponent in parms]
-        return _Term(coeff, vps)
+        key = _Term.multiply_keys(term1.key, term2.key)
+        return _Term.from_key(coeff, key)
+
+    @staticmethod
+    def multiply_keys(key1, key2):
+        """
+        This multiplies two monomials given their keys, e.g.
+        (("x", 2),) times (("x", 1), ("y", 5)) is (("x", 3), ("y", 5)).
+        """
+        if not key1:
+            return key2
+        if not key2:
+            return key1
+        exponents = dict(key1)
+        for var_name, exponent in key2:
+            exponents[var_name] = exponents.get(var_name, 0) + exponent
+        return tuple(sorted(exponents.items()))
 
     @staticmethod
     def one():
@@ -398,7 +1280,7 @@ class _Term:
     def sum(terms):
         """
         This is a helper for Poly.
-        Poly will only call us with terms that have the same sig.
+        Poly will only call us with terms that have the same key.
 
         We essentially just add up coefficients.
 
@@ -409,20 +1291,19 @@ class _Term:
         if len(terms) < 1:
             raise ValueError("We expect at least one term to be summed.")
 
-        enforce_list_element_types(terms, _Term)
+        if not trusted_mode:
+            enforce_list_element_types(terms, _Term)
         term = terms[0]
 
         if len(terms) == 1:
             return term
 
-        sig = term.sig
-        coeff = term.coeff
+        key = term.key
         for other in terms[1:]:
-            if other.sig != sig:
+            if other.key != key:
                 raise AssertionError("We cannot combine unlike terms!!!")
-            coeff = Math.add(coeff, other.coeff)
 
-        return _Term(coeff, term.var_powers)
+        return term.with_coeff(math_sum_many([other.coeff for other in terms]))
 
     @staticmethod
     def zero():
@@ -430,13 +1311,30 @@ class _Term:
 
 
 class Poly:
+    """
+    Every Poly remembers the Math handler that it was built with
+    as its "ring", and its operations always do their arithmetic
+    with that handler (see set_math).  You can't mix polynomials
+    from different rings, but you can convert a polynomial to
+    another ring with to_ring.
+
+    Poly objects are immutable, so we compute our canonical string
+    and our hash at most once, the first time somebody asks.
+    Until then these class-level defaults stand in for them.
+    """
+
+    _canonical_string = None
+    _hash = None
+
     def __init__(self, terms):
         if type(terms) in (_Term, str):
             raise ValueError(
                 "Pass in a list of _Terms or use Poly's other constructors."
             )
-        enforce_list_element_types(terms, _Term)
+        if not trusted_mode:
+            enforce_list_element_types(terms, _Term)
         self.terms = terms
+        self.ring = _math_var.get()
 
         """
         Note the invariant here. As SOON as a Poly gets constructed, it
@@ -479,10 +1377,55 @@ class Poly:
         if they use the same set of variable names.  While
         x+3 and y+3 are structurally equivalent, we consider them
         to be non-equal.
-        """
-        enforce_type(other, Poly)
+
+        For anything that isn't a Poly, we return NotImplemented,
+        so that Python can ask the other object (a LazyPoly knows
+        how to compare itself to us) or fall back to identity.
+        That way a set or dict can hold a Poly next to other keys
+        that happen to have the same hash.
+
+        Polynomials from different rings are never equal (even if
+        they print the same way), which also lets you keep them
+        together in a set or dict.  We check that before we do any
+        arithmetic, and canonicalized_string then builds each string
+        in its own ring.
+
+        Comparing strings is expensive, so we first rule out
+        most non-equal polynomials by comparing the number of terms
+        and (for the Math types that come with this library) our
+        cached hashes.  See __hash__.
+        """
+        if type(other) != Poly:
+            return NotImplemented
+        if self is other:
+            return True
+        if self.ring is not other.ring and self.ring != other.ring:
+            return False
+        if len(self.terms) != len(other.terms):
+            return False
+        if _has_faithful_hashes(self.ring) and hash(self) != hash(other):
+            return False
         return self.canonicalized_string() == other.canonicalized_string()
 
+    def __hash__(self):
+        """
+        We hash our terms' keys and coefficients, rather than our
+        canonical string, which is more expensive to build.  This
+        is consistent with __eq__ as long as the values are hashable,
+        and Math.coeff_str gives the same string for two values
+        exactly when they are equal.
+
+        That is true for the Math types that come with this library,
+        so __eq__ uses our hashes to rule out non-equal polynomials
+        quickly.  We can't count on it for other handlers, so __eq__
+        just compares strings for them (and works even if the values
+        aren't hashable).  If you want to use such polynomials in a
+        set or dict, your handler needs to live up to the rule above.
+        """
+        if self._hash is None:
+            self._hash = hash(tuple((term.key, term.coeff) for term in self.terms))
+        return self._hash
+
     def __mul__(self, other):
         return self.multiply_with(other)
 
@@ -501,8 +1444,9 @@ class Poly:
     def __rmul__(self, other):
         return self.multiply_with(other)
 
+    @_in_ring
     def __rsub__(self, other):
-        if type(other) == Math.value_type:
+        if type(other) == self.ring.value_type:
             other = Poly.constant(other)
         enforce_type(other, Poly)
         return Poly.subtract_polys(other, self)
@@ -516,24 +1460,35 @@ class Poly:
 
         return self.canonicalized_string()
 
+    @_in_ring
     def __sub__(self, other):
-        if type(other) == Math.value_type:
+        """
+        This is subtract_polys, without the extra trip through
+        _in_ring.
+        """
+        if type(other) == self.ring.value_type:
             other = Poly.constant(other)
         enforce_type(other, Poly)
-        return Poly.subtract_polys(self, other)
+        if other.is_zero():
+            return self
+        return Poly.add_polys(self, other.negated())
 
     def add_with(self, other):
         """
         We add either a Math-based constant (e.g. an integer)
         or another Poly to ourself and return a new Poly (unless
         we are adding Math.zero).
+
+        We just dispatch here, so we leave it to add_with_constant
+        and add_polys to switch to our ring (see _in_ring).
         """
-        if type(other) == Math.value_type:
+        if type(other) == self.ring.value_type:
             return self.add_with_constant(other)
         else:
             enforce_type(other, Poly)
             return Poly.add_polys(self, other)
 
+    @_in_ring
     def add_with_constant(self, c):
         enforce_type(c, Math.value_type)
         if c == Math.zero:
@@ -545,6 +1500,7 @@ class Poly:
         """
         return Poly.add_polys(self, Poly.constant(c))
 
+    @_in_ring
     def apply(self, **var_assignments):
         """
         This does a partial application of a subset of variables to
@@ -562,14 +1518,219 @@ class Poly:
                 raise ValueError(f"{var} is not a variable for {self}")
         return Poly([term.apply(**var_assignments) for term in self.terms])
 
+    @_in_ring
     def canonicalized_string(self):
         """
         This method is easy, because we do the heavy lifting of calling
-        put_terms_in_order when we make a Poly object.
+        put_terms_in_order when we make a Poly object.  We only build
+        the string once.
+        """
+        if self._canonical_string is None:
+            if len(self.terms) == 0:
+                self._canonical_string = str(Math.zero)
+            else:
+                self._canonical_string = "+".join(
+                    term.canonicalized_string() for term in self.terms
+                )
+        return self._canonical_string
+
+    @_in_ring
+    def compile(self, codegen=False):
+        """
+        This returns a function that computes the same value as
+        self.eval(), but is much faster to call over and over:
+
+            f = p.compile()
+            assert f(x=5, y=7) == p.eval(x=5, y=7)
+
+        All the checking of our terms happens up front.  For each
+        call, we compute the powers of each variable that our terms
+        actually use exactly once, and then every term just looks
+        them up.  (Compare that to eval, which recomputes x**2 for
+        every term that mentions it.)
+
+        Note that the compiled function only checks that you supply
+        every variable; it trusts you to pass values of the right
+        Math.value_type.
+
+        If you set codegen=True, and our Math is IntegerMath or
+        FractionMath, we instead generate straight-line Python code
+        for the polynomial, which is faster still.  We never put any
+        of your strings into that code except the variable names,
+        which we already know to be Python identifiers.
+        """
+        var_names, needed_exponents, plan = self.evaluation_plan()
+
+        def check(var_assignments):
+            for var_name in var_names:
+                if var_name not in var_assignments:
+                    raise ValueError(f"The var {var_name} was not supplied.")
+
+        if codegen:
+            evaluate = _generate_python_evaluator(plan, var_names, needed_exponents)
+
+            def compiled(**var_assignments):
+                check(var_assignments)
+                return evaluate(*(var_assignments[v] for v in var_names))
+
+            return compiled
+
+        math_handler = self.ring
+
+        def compiled(**var_assignments):
+            check(var_assignments)
+            powers = []
+            for var_name, exponents in zip(var_names, needed_exponents):
+                value = var_assignments[var_name]
+                var_powers = {}
+                power = math_handler.one
+                prev_exponent = 0
+                for exponent in exponents:
+                    gap = exponent - prev_exponent
+                    if gap == 1:
+                        power = math_handler.mul(power, value)
+                    else:
+                        power = math_handler.mul(power, math_handler.power(value, gap))
+                    var_powers[exponent] = power
+                    prev_exponent = exponent
+                powers.append(var_powers)
+
+            coeffs = []
+            products = []
+            for coeff, factors in plan:
+                coeffs.append(coeff)
+                products.append(
+                    math_mul_many(
+                        [powers[i][exponent] for i, exponent in factors], math_handler
+                    )
+                )
+            return math_dot(coeffs, products, math_handler)
+
+        return compiled
+
+    @_in_ring
+    def eval_many(self, **var_arrays):
+        """
+        This is like eval, except that each variable gets a whole
+        NumPy array of values, and we return an array of results:
+
+            p.eval_many(x=numpy.array([1, 2, 3]), y=numpy.array([4, 5, 6]))
+
+        We use the same plan as compile, but every multiplication
+        and addition works on whole arrays at once.
+
+        For IntegerMath, we bound the size of every intermediate
+        value before we start.  If everything fits in 64 bits, we
+        do the math with fast int64 arrays; otherwise we fall back to
+        arrays of Python ints, which are slower but exact.  (We never
+        use floats, so we don't have the rounding problems shown in
+        examples/numpy_compare.py.)
+
+        For other Math types, we apply the Math operations to object
+        arrays, so the results are exactly what eval would produce.
+
+        NumPy is optional for this library as a whole, so we only
+        import it here.
+        """
+        import numpy
+
+        var_names, needed_exponents, plan = self.evaluation_plan()
+        for var_name in var_names:
+            if var_name not in var_arrays:
+                raise ValueError(f"The var {var_name} was not supplied.")
+
+        arrays = {}
+        for var_name, values in var_arrays.items():
+            enforce_type(var_name, str)
+            arrays[var_name] = numpy.asarray(values)
+        shapes = {array.shape for array in arrays.values()}
+        if len(shapes) > 1:
+            raise ValueError("All the arrays must have the same shape.")
+        shape = shapes.pop() if shapes else ()
+
+        arrays = [arrays[var_name] for var_name in var_names]
+        for array in arrays:
+            if array.dtype.kind not in "iuO":
+                raise TypeError(f"{array.dtype} arrays are not supported.")
+        if self.ring is not integer_math.IntegerMath:
+            """
+            We only use NumPy's integer arithmetic for IntegerMath.
+            Otherwise we turn integer arrays into arrays of Python
+            ints, and we check those values just like eval would.
+            """
+            arrays = [array.astype(object) for array in arrays]
+        for array in arrays:
+            if array.dtype.kind == "O":
+                for value in array.flat:
+                    enforce_type(value, Math.value_type)
+
+        use_int64 = self.ring is integer_math.IntegerMath and Poly.int64_is_safe(
+            plan, [array.astype(object) for array in arrays]
+        )
+
+        if use_int64:
+            arrays = [array.astype(numpy.int64) for array in arrays]
+            dtype = numpy.int64
+            add, mul, power = numpy.add, numpy.multiply, numpy.power
+        elif self.ring is integer_math.IntegerMath:
+            arrays = [array.astype(object) for array in arrays]
+            dtype = object
+            add, mul, power = numpy.add, numpy.multiply, numpy.power
+        else:
+            arrays = [array.astype(object) for array in arrays]
+            dtype = object
+            add = numpy.frompyfunc(Math.add, 2, 1)
+            mul = numpy.frompyfunc(Math.mul, 2, 1)
+            power = numpy.frompyfunc(Math.power, 2, 1)
+
+        powers = []
+        for array, exponents in zip(arrays, needed_exponents):
+            var_powers = {}
+            prev_exponent = 0
+            power_array = None
+            for exponent in exponents:
+                gap = exponent - prev_exponent
+                factor = array if gap == 1 else power(array, gap)
+                if power_array is None:
+                    power_array = factor
+                else:
+                    power_array = mul(power_array, factor)
+                var_powers[exponent] = power_array
+                prev_exponent = exponent
+            powers.append(var_powers)
+
+        result = numpy.full(shape, Math.zero, dtype=dtype)
+        for coeff, factors in plan:
+            product = numpy.full(shape, coeff, dtype=dtype)
+            for i, exponent in factors:
+                product = mul(product, powers[i][exponent])
+            result = add(result, product)
+        return result
+
+    def evaluation_plan(self):
+        """
+        This is a helper for compile and eval_many.  It returns
+
+            - our sorted variable names
+            - for each variable, the sorted list of exponents that
+              our terms actually use
+            - for each term, its coefficient and a list of
+              (variable index, exponent) pairs
         """
-        if len(self.terms) == 0:
-            return str(Math.zero)
-        return "+".join(term.canonicalized_string() for term in self.terms)
+        var_names = sorted(self.variables())
+        var_index = {var_name: i for i, var_name in enumerate(var_names)}
+
+        needed_exponents = [set() for _ in var_names]
+        plan = []
+        for term in self.terms:
+            factors = []
+            for var_name, exponent in term.key:
+                i = var_index[var_name]
+                needed_exponents[i].add(exponent)
+                factors.append((i, exponent))
+            plan.append((term.coeff, factors))
+        needed_exponents = [sorted(exponents) for exponents in needed_exponents]
+        return var_names, needed_exponents, plan
 
     def is_one(self):
         return len(self.terms) == 1 and self.terms[0].is_one()
@@ -581,45 +1742,77 @@ class Poly:
         """
         This method converts a Poly to a Math value (e.g. integer) by
         using the supplied variable assignments.
-        """
-        my_var_names = self.variables()
 
-        enforce_dict_types(var_assignments, str, Math.value_type)
+        People call eval over and over, so we keep it lean.  We look
+        up our ring once and hand it to each term (see
+        _Term.evaluate), rather than going through _in_ring and
+        having every term check the assignments again.  We only look
+        for missing variables if a lookup fails.
+        """
+        ring = self.ring
+        if _active_profile is not None and _math_var.get() is not ring:
+            with using_math(ring):
+                return self.eval(**var_assignments)
+        handler = ring if _active_profile is None else _local_math()
+
+        enforce_dict_types(var_assignments, str, handler.value_type)
+
+        add = handler.add
+        result = handler.zero
+        try:
+            for term in self.terms:
+                result = add(result, term.evaluate(var_assignments, handler))
+        except KeyError:
+            for var_name in sorted(self.variables()):
+                if var_name not in var_assignments:
+                    raise ValueError(f"The var {var_name} was not supplied.")
+            raise
+        return result
 
-        for var_name in my_var_names:
-            if var_name not in var_assignments:
-                raise ValueError(f"The var {var_name} was not supplied.")
+    def lazy(self):
+        """
+        This wraps us in a LazyPoly, so that further arithmetic
+        builds an expression graph instead of expanding right away.
+        See lazy.py.
+        """
+        from . import lazy
 
-        result = Math.zero
-        for term in self.terms:
-            result = Math.add(result, term.eval(**var_assignments))
-        return result
+        return lazy.LazyPoly.leaf(self)
 
+    @_in_ring
     def multiply_by_constant(self, c):
         """
         We rely on the distributive property here.  If you multiply
         a polynomial by a constant, that is just like multiplying each
         of its terms by a constant.
         """
-        enforce_type(c, Math.value_type)
-        return Poly([term.multiply_by_constant(c) for term in self.terms])
+        enforce_type(c, self.ring.value_type)
+        return Poly._from_ordered_terms(
+            [term.multiply_by_constant(c) for term in self.terms]
+        )
 
     def multiply_with(self, other):
+        """
+        Like add_with, this just dispatches to methods that switch
+        to our ring.
+        """
         if type(other) == _Term:
             raise ValueError("Use Poly contructors to build up terms.")
 
-        if type(other) == Math.value_type:
+        if type(other) == self.ring.value_type:
             return self.multiply_by_constant(other)
 
         enforce_type(other, Poly)
         return Poly.multiply_polys(self, other)
 
+    @_in_ring
     def negated(self):
         """
         This is the additive inverse.
         """
-        return Poly([term.negate() for term in self.terms])
+        return Poly._from_ordered_terms([term.negate() for term in self.terms])
 
+    @_in_ring
     def numpy_vector(self):
         my_var_names = self.variables()
         if len(my_var_names) != 1:
@@ -650,18 +1843,124 @@ class Poly:
         We do this process as soon as we construct any Poly object,
         and it is important that we are deterministic, as it allows
         us to determine if two Poly objects are equivalent.
+
+        Note that adding more variables doesn't change the relative
+        order of any two terms, so we can precompute a sort key for
+        each term on its own (see order_key).  That also means that
+        we can merge the terms of two Polys in linear time, without
+        re-sorting (see merge_ordered_terms).
         """
         if len(self.terms) <= 1:
             return
-        sorted_vars = sorted(self.variables())
-        self.terms.sort(key=lambda term: term.sort_key(sorted_vars), reverse=True)
+        self.terms.sort(key=operator.attrgetter("order_key"), reverse=True)
+
+    @_in_ring
+    def multinomial_expansion(self, exponent):
+        """
+        This computes p**n directly from the multinomial theorem.  If p
+        has terms t1, t2, ..., tk, then every term of p**n looks like
+
+            C * (t1**n1) * (t2**n2) * ... * (tk**nk)
+
+        where n1 + n2 + ... + nk == n, and C is the multinomial
+        coefficient n!/(n1!*n2!*...*nk!).
+
+        We build C as a product of binomial coefficients.  As we count
+        n1 down from r (the part of the exponent that is left), we get
+        each binomial coefficient from the previous one, since
+
+            comb(r, j - 1) == comb(r, j) * j // (r - j + 1)
+
+        so we never hold more than one binomial coefficient per term
+        of p.  We do that with Python integers, and then we turn each
+        C into our Math type (see math_from_int).
 
+        We walk the ways to split n with an explicit stack rather
+        than recursion, so this works for any number of terms.  But
+        the amount of work is proportional to the number of ways to
+        split n into k parts, so this is only a good idea when p has
+        just a few terms.  See raised_to_exponent.
+        """
+        enforce_type(exponent, int)
+        if exponent < 0:
+            raise ValueError("we do not support negative exponents")
+        terms = self.terms
+        k = len(terms)
+        if exponent == 0:
+            return Poly.one()
+        if k <= 1:
+            return Poly([term.raised_to_exponent(exponent) for term in terms])
+
+        term_powers = []
+        for term in terms:
+            powers = [_Term.one(), term]
+            for _ in range(2, exponent + 1):
+                powers.append(_Term.multiply_terms(powers[-1], term))
+            term_powers.append(powers)
+        last_powers = term_powers[-1]
+
+        """
+        Each entry on the stack says that we are about to give n_i of
+        the remaining exponent to term i, where binomial is
+        comb(remaining, n_i), and coeff and product come from the
+        terms before i.
+        """
+        new_terms = []
+        stack = [(0, exponent, exponent, 1, 1, _Term.one())]
+        while stack:
+            i, remaining, n_i, binomial, coeff, product = stack.pop()
+            if n_i > 0:
+                next_binomial = binomial * n_i // (remaining - n_i + 1)
+                stack.append((i, remaining, n_i - 1, next_binomial, coeff, product))
+
+            coeff *= binomial
+            product = _Term.multiply_terms(product, term_powers[i][n_i])
+            remaining -= n_i
+            if i == k - 2:
+                term = _Term.multiply_terms(product, last_powers[remaining])
+                new_terms.append(term.multiply_by_constant(math_from_int(coeff)))
+            else:
+                stack.append((i + 1, remaining, remaining, 1, coeff, product))
+
+        return Poly(new_terms)
+
+    @_in_ring
+    def powers(self, exponents):
+        """
+        This returns a dict that maps each of the exponents to
+        our polynomial raised to that exponent.  We work our way
+        up from the smallest exponent, so each power is built from
+        the previous one, e.g. p**7 == p**5 * p**2.
+        """
+        result = {}
+        prev_exponent = None
+        prev_power = None
+        for exponent in sorted(exponents):
+            enforce_type(exponent, int)
+            if prev_power is None:
+                power = self.raised_to_exponent(exponent)
+            else:
+                gap = exponent - prev_exponent
+                power = Poly.multiply_polys(prev_power, self.raised_to_exponent(gap))
+            result[exponent] = power
+            prev_exponent = exponent
+            prev_power = power
+        return result
+
+    @_in_ring
     def raised_to_exponent(self, exponent):
         """
-        Our definition of p***4 is literally p*p*p*p.
+        Our definition of p**4 is literally p*p*p*p.
 
         We only support the high-school-math notion of exponentation;
         p**4 is just a shorthand for a discrete number of multiplications.
+
+        We don't actually do all those multiplications, though.  For
+        a polynomial with only a few terms we use the multinomial
+        theorem (see multinomial_expansion), which does work in
+        proportion to the size of the result.  Otherwise we use
+        repeated squaring, so p**100 only needs about a dozen calls
+        to multiply_polys.
         """
         enforce_type(exponent, int)
         if exponent < 0:
@@ -669,9 +1968,56 @@ class Poly:
 
         if exponent == 0:
             return Poly.one()
-        if exponent == 1:
+        if exponent == 1 or self.is_zero() or self.is_one():
             return self
-        return self * self.raised_to_exponent(exponent - 1)
+        if len(self.terms) == 1:
+            return Poly([self.terms[0].raised_to_exponent(exponent)])
+
+        if self.prefers_multinomial_expansion(exponent):
+            return self.multinomial_expansion(exponent)
+
+        result = None
+        base = self
+        while True:
+            if exponent & 1:
+                result = base if result is None else Poly.multiply_polys(result, base)
+            exponent >>= 1
+            if exponent == 0:
+                return result
+            base = Poly.multiply_polys(base, base)
+
+    def prefers_multinomial_expansion(self, exponent):
+        """
+        The multinomial expansion enumerates every way to split the
+        exponent among our terms, which is ideal for something like
+        (x+y+z)**200, where almost every split produces a distinct
+        term.
+
+        But for something like (1+x+x**2+x**3)**200 most of those
+        splits collapse into the same few hundred terms, and
+        repeated squaring is far cheaper.  Repeated squaring costs
+        roughly the square of the size of p**(n/2), which we can
+        bound by the degrees of our variables.
+
+        Each split also costs a few Python-level steps, where a
+        multiplication mostly works on dicts of keys, so we only
+        consider polynomials with at most MULTINOMIAL_TERM_LIMIT
+        terms.
+        """
+        k = len(self.terms)
+        if k > MULTINOMIAL_TERM_LIMIT:
+            return False
+        splits = math.comb(exponent + k - 1, k - 1)
+
+        half = exponent // 2
+        half_size = math.comb(half + k - 1, k - 1)
+        degree_bound = 1
+        for var_name in self.variables():
+            degree = max(term.degree_of_var(var_name) for term in self.terms)
+            degree_bound *= half * degree + 1
+        half_size = min(half_size, degree_bound)
+
+        return splits <= half_size * half_size
 
     def simplify(self):
         """
@@ -686,6 +2032,7 @@ class Poly:
         (Note that we do the simplification process as soon as a
         Poly object is constructed.)
         """
+        Math = _local_math()
         terms = self.terms
         if len(terms) == 0:
             return
@@ -701,8 +2048,7 @@ class Poly:
         """
         buckets = collections.defaultdict(list)
         for term in terms:
-            sig = term.sig
-            buckets[sig].append(term)
+            buckets[term.key].append(term)
 
         new_terms = []
         for sub_terms in buckets.values():
@@ -712,6 +2058,7 @@ class Poly:
 
         self.terms = new_terms
 
+    @_in_ring
     def substitute(self, var_name, var_poly):
         """
         assert (2 * x + 1).substitute("x", u + 3) == 2 * u + 7
@@ -721,13 +2068,135 @@ class Poly:
         if var_name not in self.variables():
             raise ValueError("Unknown variable")
 
-        new_polys = [
-            Poly.poly_based_on_term_with_variable_substitution(term, var_name, var_poly)
-            for term in self.terms
+        """
+        See set_substitution_cache_size.  Since the answer depends
+        on our Math type, that is part of the cache key.
+        """
+        cache_key = None
+        if _substitution_cache.max_size > 0:
+            cache_key = (self.ring, self, var_name, var_poly)
+            result = _substitution_cache.lookup(cache_key)
+            if result is not None:
+                return result
+
+        """
+        Lots of our terms are likely to share the same power of
+        the substituted variable, so we compute each power of
+        var_poly just once (see powers).  Then we multiply each
+        term's leftover piece into the right power, accumulating
+        coefficients by monomial, as in multiply_polys.
+        """
+        factorizations = [term.factorize_on_var(var_name) for term in self.terms]
+        powers = var_poly.powers({exponent for _, exponent in factorizations})
+
+        products = {}
+        for smaller_term, exponent in factorizations:
+            Poly.accumulate_products(products, smaller_term, powers[exponent])
+        result = Poly.from_key_dict(products)
+
+        if cache_key is not None:
+            _substitution_cache.add(cache_key, result)
+        return result
+
+    @_in_ring
+    def substitute_many(self, replacements):
+        """
+        This substitutes several variables at the same time:
+
+            p.substitute_many({"x": u + 1, "y": u * v})
+
+        Unlike a chain of calls to substitute, we never build any
+        intermediate polynomials, which can be much bigger than
+        the final result.  Also, the substitutions happen all at
+        once, so {"x": y, "y": x} swaps x and y.
+
+        For each variable, we compute just the powers of its
+        replacement that our terms need (see powers).  Then we
+        multiply out each distinct combination of those powers
+        once, and accumulate each term's leftover piece times that
+        combination directly into the result.
+        """
+        enforce_type(replacements, dict)
+        my_vars = self.variables()
+        for var_name, var_poly in replacements.items():
+            enforce_type(var_name, str)
+            enforce_type(var_poly, Poly)
+            if var_name not in my_vars:
+                raise ValueError("Unknown variable")
+        _ring_of([self] + list(replacements.values()))
+
+        if not replacements:
+            return self
+
+        cache_key = None
+        if _substitution_cache.max_size > 0:
+            cache_key = (
+                self.ring,
+                self,
+                tuple(
+                    (var_name, replacements[var_name])
+                    for var_name in sorted(replacements)
+                ),
+            )
+            result = _substitution_cache.lookup(cache_key)
+            if result is not None:
+                return result
+
+        substituted_vars = set(replacements)
+        factorizations = [
+            term.factorize_on_vars(substituted_vars) for term in self.terms
         ]
 
-        return Poly.sum(new_polys)
+        needed_exponents = collections.defaultdict(set)
+        for _, substituted_key in factorizations:
+            for var_name, exponent in substituted_key:
+                needed_exponents[var_name].add(exponent)
+        powers = {
+            var_name: replacements[var_name].powers(exponents)
+            for var_name, exponents in needed_exponents.items()
+        }
+
+        combinations = {(): Poly.one()}
+
+        def combination(substituted_key):
+            if substituted_key not in combinations:
+                var_name, exponent = substituted_key[-1]
+                combinations[substituted_key] = Poly.multiply_polys(
+                    combination(substituted_key[:-1]), powers[var_name][exponent]
+                )
+            return combinations[substituted_key]
 
+        products = {}
+        for smaller_term, substituted_key in factorizations:
+            Poly.accumulate_products(
+                products, smaller_term, combination(substituted_key)
+            )
+        result = Poly.from_key_dict(products)
+
+        if cache_key is not None:
+            _substitution_cache.add(cache_key, result)
+        return result
+
+    def to_ring(self, ring):
+        """
+        This converts us to a Poly over another ring, which just takes
+        one pass over our terms, since our monomials (and thus their
+        order) stay the same:
+
+            q = p.to_ring(ModulusMath(7))
+
+        The new ring converts each coefficient with its convert method,
+        if it has one, or else with its value_type.  Terms whose
+        coefficients become zero go away.
+        """
+        if ring is self.ring or ring == self.ring:
+            return self
+        convert = getattr(ring, "convert", ring.value_type)
+        with using_math(ring):
+            terms = [term.with_coeff(convert(term.coeff)) for term in self.terms]
+            return Poly._from_ordered_terms(terms)
+
+    @_in_ring
     def transform_coefficients(self, f):
         """
         This lets you apply a function to all coefficients in your Poly,
@@ -738,27 +2207,51 @@ class Poly:
         """
         assert callable(f)
         terms = [t.transform_coefficient(f) for t in self.terms]
-        return Poly(terms)
+        return Poly._from_ordered_terms(terms)
 
     def variables(self):
         vars = set()
         for term in self.terms:
-            vars |= term.var_names
+            vars.update(var_name for var_name, _ in term.key)
         return vars
 
     @staticmethod
+    def accumulate_products(products, term, poly):
+        """
+        This adds the product of term and poly into products, which
+        maps monomial keys to coefficients.  See multiply_polys.
+        """
+        Math = _local_math()
+        if term.coeff == Math.zero:
+            return
+        multiply_keys = _Term.multiply_keys
+        key1 = term.key
+        coeff1 = term.coeff
+        for t2 in poly.terms:
+            key = multiply_keys(key1, t2.key)
+            coeff = Math.mul(coeff1, t2.coeff)
+            if key in products:
+                products[key] = Math.add(products[key], coeff)
+            else:
+                products[key] = coeff
+
+    @staticmethod
+    @_in_ring
     def add_polys(poly1, poly2):
         """
-        All the heavy lifting happens when we construct the
-        new Poly--see __init__ for more context.
+        Both of our inputs are already in canonical order, so we just
+        merge their terms in linear time.  See merge_ordered_terms.
         """
-        enforce_type(poly1, Poly)
-        enforce_type(poly2, Poly)
+        if not trusted_mode:
+            enforce_type(poly1, Poly)
+            enforce_type(poly2, Poly)
         if poly1.is_zero():
             return poly2
         if poly2.is_zero():
             return poly1
-        return Poly(poly1.terms + poly2.terms)
+        return Poly._from_ordered_terms(
+            Poly.merge_ordered_terms([poly1.terms, poly2.terms])
+        )
 
     @staticmethod
     def constant(c):
@@ -766,12 +2259,179 @@ class Poly:
         return Poly([_Term.constant(c)])
 
     @staticmethod
-    def multiply_polys(poly1, poly2):
+    def int64_is_safe(plan, arrays):
         """
-        We mostly rely on Poly.__init__ to do the heavy lifting here.
+        This is a helper for eval_many.  Every intermediate value
+        in our computation is bounded by
+
+            sum(abs(coeff) * max_x**ex * max_y**ey * ...)
+
+        where max_x is the largest absolute value in the x array,
+        and so on, so if that sum fits in 64 bits, no int64 math
+        can overflow.
+        """
+        limit = 2**63 - 1
+        maxes = [
+            max((abs(value) for value in array.flat), default=0) for array in arrays
+        ]
+        total = 0
+        for coeff, factors in plan:
+            bound = abs(coeff)
+            for i, exponent in factors:
+                bound *= maxes[i] ** exponent
+                if bound > limit:
+                    return False
+            total += bound
+            if total > limit:
+                return False
+        return True
+
+    @staticmethod
+    @_in_ring_generator
+    def iter_expand_power(p, exponent):
+        """
+        This yields the terms of p**exponent in canonical order,
+        without ever holding all of them in memory.  We do build
+        p**(exponent//2) and p**(exponent - exponent//2), but those
+        are usually MUCH smaller than the full expansion, and then we
+        stream their product (see Poly.iter_product).
+
+            for term in Poly.iter_expand_power(x + y + z + w, 40):
+                ...
+        """
+        enforce_type(p, Poly)
+        enforce_type(exponent, int)
+        if exponent < 0:
+            raise ValueError("we do not support negative exponents")
+
+        if exponent == 0:
+            yield _Term.one()
+            return
+        if exponent == 1:
+            yield from p.terms
+            return
+
+        half = p.raised_to_exponent(exponent // 2)
+        other_half = half if exponent % 2 == 0 else Poly.multiply_polys(half, p)
+        yield from Poly.iter_product(half, other_half)
+
+    @staticmethod
+    @_in_ring_generator
+    def iter_product(poly1, poly2):
+        """
+        This yields the terms of poly1 * poly2 in canonical order,
+        a slab at a time, so you can filter them or write them out
+        without building the whole product.
+
+        Our canonical order looks at the first variable (in
+        alphabetical order) before anything else, so we group the
+        terms of each factor by their exponent of that variable.  The
+        terms of the product whose leading exponent is d only come
+        from pairs whose leading exponents add up to d, so we can
+        build the product one value of d at a time, from the biggest
+        to the smallest.  We only hold on to one slab of the result
+        at a time.
+
+        Within a slab, we write each monomial as a single integer,
+        with one "digit" per variable, in a radix that is big enough
+        that adding two of them never carries.  Then multiplying two
+        monomials is just an addition, and sorting the integers puts
+        the slab in canonical order.
         """
         enforce_type(poly1, Poly)
         enforce_type(poly2, Poly)
+        if poly1.is_zero() or poly2.is_zero():
+            return
+
+        var_names = sorted(poly1.variables() | poly2.variables())
+
+        def degree(p, var_name):
+            return max(term.degree_of_var(var_name) for term in p.terms)
+
+        radix = 1 + max(
+            (
+                degree(poly1, var_name) + degree(poly2, var_name)
+                for var_name in var_names
+            ),
+            default=0,
+        )
+
+        def slabs(p):
+            result = collections.defaultdict(list)
+            for term in p.terms:
+                exponents = dict(term.key)
+                packed = 0
+                for var_name in var_names:
+                    packed = packed * radix + exponents.get(var_name, 0)
+                lead = exponents.get(var_names[0], 0) if var_names else 0
+                result[lead].append((packed, term.coeff))
+            return result
+
+        def make_term(packed, coeff):
+            key = []
+            for var_name in reversed(var_names):
+                packed, exponent = divmod(packed, radix)
+                if exponent:
+                    key.append((var_name, exponent))
+            return _Term.from_key(coeff, tuple(reversed(key)))
+
+        slabs1 = slabs(poly1)
+        slabs2 = slabs(poly2)
+        leads = sorted({i + j for i in slabs1 for j in slabs2}, reverse=True)
+
+        Math = _local_math()
+
+        for lead in leads:
+            products = {}
+            for i, rows1 in slabs1.items():
+                rows2 = slabs2.get(lead - i)
+                if rows2 is None:
+                    continue
+                for packed1, coeff1 in rows1:
+                    for packed2, coeff2 in rows2:
+                        packed = packed1 + packed2
+                        coeff = Math.mul(coeff1, coeff2)
+                        if packed in products:
+                            products[packed] = Math.add(products[packed], coeff)
+                        else:
+                            products[packed] = coeff
+            for packed in sorted(products, reverse=True):
+                coeff = products[packed]
+                if coeff != Math.zero:
+                    yield make_term(packed, coeff)
+
+    @staticmethod
+    def merge_ordered_terms(term_lists):
+        """
+        Each of the lists must already be in canonical order (and have
+        no like terms within itself), which is true for the terms of
+        any Poly.  We do a k-way merge of the lists, which keeps like
+        terms next to each other, so we can combine them as we go.
+
+        We may return terms with zero coefficients; see
+        _from_ordered_terms.
+        """
+        Math = _local_math()
+        merged = heapq.merge(
+            *term_lists, key=operator.attrgetter("order_key"), reverse=True
+        )
+        terms = []
+        for term in merged:
+            if terms and terms[-1].key == term.key:
+                terms[-1] = terms[-1].with_coeff(Math.add(terms[-1].coeff, term.coeff))
+            else:
+                terms.append(term)
+        return terms
+
+    @staticmethod
+    @_in_ring
+    def multiply_polys(poly1, poly2):
+        """
+        We mostly rely on Poly.__init__ to do the heavy lifting here.
+        """
+        if not trusted_mode:
+            enforce_type(poly1, Poly)
+            enforce_type(poly2, Poly)
 
         if poly1.is_zero():
             return poly1
@@ -782,20 +2442,138 @@ class Poly:
         if poly2.is_one():
             return poly1
 
+        """
+        Rather than building every one of the len(poly1)*len(poly2)
+        partial products as a _Term, we accumulate coefficients
+        directly into a dict keyed on the monomial keys, so we
+        only ever hold on to as many coefficients as there are
+        terms in the result.
+        """
+        products = {}
+        for t1 in poly1.terms:
+            Poly.accumulate_products(products, t1, poly2)
+        return Poly.from_key_dict(products)
+
+    @staticmethod
+    def from_key_dict(coeffs_by_key):
+        """
+        This builds a Poly from a dict that maps monomial keys
+        (see _Term) to coefficients.  Since the keys of a dict are
+        distinct, the only simplification left to do is to drop
+        the zero coefficients, so we skip Poly.simplify.
+        """
+        if not trusted_mode:
+            enforce_type(coeffs_by_key, dict)
         terms = [
-            _Term.multiply_terms(t1, t2) for t1 in poly1.terms for t2 in poly2.terms
+            _Term.from_key(coeff, key)
+            for key, coeff in coeffs_by_key.items()
+            if coeff != Math.zero
         ]
-        return Poly(terms)
+        return Poly._from_simplified_terms(terms)
 
     @staticmethod
     def one():
         return Poly.constant(Math.one)
 
     @staticmethod
+    def parse(text):
+        """
+        This is the inverse of canonicalized_string:
+
+            assert Poly.parse(str(p)) == p
+
+        We also accept terms in any order, like terms that need to be
+        combined, and variables in any order within a term, but then
+        we have to simplify and sort, like any other Poly.  If the
+        text is already canonical, we just check that as we go, so
+        parsing takes linear time.
+
+        Coefficients are parsed by Math.value_type, so set the
+        same Math handler that you used to produce the string.
+        """
+        enforce_type(text, str)
+        return Poly.from_parsed_terms(Poly.parse_terms([text]))
+
+    @staticmethod
+    def parse_file(f, chunk_size=1 << 20):
+        """
+        This is like Poly.parse, but it reads from an open text file
+        a chunk at a time, so we never hold the whole string in memory.
+        """
+        chunks = iter(lambda: f.read(chunk_size), "")
+        return Poly.from_parsed_terms(Poly.parse_terms(chunks))
+
+    @staticmethod
+    def parse_term(text):
+        coeff = Math.one
+        var_dict = {}
+        pos = 0
+        while True:
+            match = _factor_pattern.match(text, pos)
+            if match is None:
+                raise ValueError(f"We cannot parse the term {text!r}.")
+            if match["var_name"] is not None:
+                var_name = match["var_name"]
+                exponent = int(match["exponent"])
+            elif match["var"] is not None:
+                var_name = match["var"]
+                exponent = 1
+            else:
+                value = Math.value_type(match["negative"] or match["positive"])
+                coeff = Math.mul(coeff, value)
+                var_name = None
+
+            if var_name is not None and exponent > 0:
+                var_dict[var_name] = var_dict.get(var_name, 0) + exponent
+
+            pos = match.end()
+            if pos == len(text):
+                break
+            if text[pos] != "*":
+                raise ValueError(f"We cannot parse the term {text!r}.")
+            pos += 1
+
+        key = tuple(sorted(var_dict.items()))
+        return _Term.from_key(coeff, key)
+
+    @staticmethod
+    def parse_terms(chunks):
+        """
+        This yields a _Term for each term in the text, which comes to
+        us as an iterable of chunks of text.  Terms are separated by
+        "+", and there are no "+" signs inside of terms, so we only
+        need to carry over the text after the last "+" of each chunk.
+        """
+        leftover = ""
+        for chunk in chunks:
+            pieces = (leftover + chunk).split("+")
+            leftover = pieces.pop()
+            for piece in pieces:
+                yield Poly.parse_term(piece.strip())
+        yield Poly.parse_term(leftover.strip())
+
+    @staticmethod
+    def from_parsed_terms(terms):
+        """
+        If the terms arrive in strictly descending order, they are
+        already distinct and in canonical order, so we skip the
+        expensive simplify/sort steps of Poly.__init__.
+        """
+        terms = list(terms)
+        in_order = all(
+            terms[i].order_key > terms[i + 1].order_key for i in range(len(terms) - 1)
+        )
+        if in_order:
+            return Poly._from_ordered_terms(terms)
+        return Poly(terms)
+
+    @staticmethod
+    @_in_ring
     def poly_based_on_term_with_variable_substitution(term, var_name, var_poly):
-        enforce_type(term, _Term)
-        enforce_type(var_name, str)
-        enforce_type(var_poly, Poly)
+        if not trusted_mode:
+            enforce_type(term, _Term)
+            enforce_type(var_name, str)
+            enforce_type(var_poly, Poly)
 
         smaller_term, exponent = term.factorize_on_var(var_name)
         small_poly = Poly([smaller_term])
@@ -807,12 +2585,14 @@ class Poly:
             )
 
     @staticmethod
+    @_in_ring
     def subtract_polys(poly1, poly2):
-        enforce_type(poly1, Poly)
-        enforce_type(poly2, Poly)
+        if not trusted_mode:
+            enforce_type(poly1, Poly)
+            enforce_type(poly2, Poly)
         if poly2.is_zero():
             return poly1
-        return poly1 + poly2.negated()
+        return Poly.add_polys(poly1, poly2.negated())
 
     @staticmethod
     def sum(poly_list):
@@ -820,8 +2600,16 @@ class Poly:
         You can use ordinary Python sum() on a list of polynomials,
         but this should be faster, since it avoids creating a bunch
         of intermediate partial polynomial sums for large lists.
+
+        We add up the coefficients in a dict keyed on the monomial
+        keys, like multiply_polys does.  A k-way merge of the sorted
+        term lists (see merge_ordered_terms) avoids the final sort,
+        but heapq.merge calls back into Python for every term, and
+        that costs more than sorting the (usually much shorter)
+        list of distinct monomials.
         """
-        enforce_list_element_types(poly_list, Poly)
+        if not trusted_mode:
+            enforce_list_element_types(poly_list, Poly)
 
         if len(poly_list) == 0:
             return Poly.zero()
@@ -829,10 +2617,17 @@ class Poly:
         if len(poly_list) == 1:
             return poly_list[0]
 
-        terms = []
-        for p in poly_list:
-            terms.extend(p.terms)
-        return Poly(terms)
+        with using_math(_ring_of(poly_list)):
+            Math = _local_math()
+            coeffs_by_key = {}
+            for p in poly_list:
+                for term in p.terms:
+                    key = term.key
+                    if key in coeffs_by_key:
+                        coeffs_by_key[key] = Math.add(coeffs_by_key[key], term.coeff)
+                    else:
+                        coeffs_by_key[key] = term.coeff
+            return Poly.from_key_dict(coeffs_by_key)
 
     @staticmethod
     def var(label):
@@ -846,13 +2641,46 @@ class Poly:
         variables are just implicitly used inside of _VarPower,
         _Term, and Poly.
         """
-        enforce_type(label, str)
+        enforce_legal_variable_name(label)
         coeff = Math.one
         exponent = 1  # exponents are ALWAYS integers
-        var_power = _VarPower(label, exponent)
+        var_power = _VarPower.make(label, exponent)
         term = _Term(coeff, [var_power])
         return Poly([term])
 
     @staticmethod
     def zero():
         return Poly([])
+
+    @staticmethod
+    def _from_ordered_terms(terms):
+        """
+        This is for callers that already have distinct terms in
+        canonical order, so the only thing left to do is to drop
+        the zero terms.
+        """
+        if not trusted_mode:
+            enforce_list_element_types(terms, _Term)
+        ring = _math_var.get()
+        zero = ring.zero
+        poly = Poly.__new__(Poly)
+        poly.terms = [term for term in terms if term.coeff != zero]
+        poly.ring = ring
+        return poly
+
+    @staticmethod
+    def _from_simplified_terms(terms):
+        """
+        This is for callers that have already combined like terms
+        and removed zero terms, so only the sorting is left to do.
+        """
+        if not trusted_mode:
+            enforce_list_element_types(terms, _Term)
+        poly = Poly.__new__(Poly)
+        poly.terms = terms
+        poly.ring = _math_var.get()
+        poly.put_terms_in_order()
+        return poly
+
+
+_RING_TYPES.add(Poly)
@@ -0,0 +1,268 @@
+import mmap
+from fractions import Fraction
+from . import fraction_math, integer_math, modulus_math, poly
+from .poly import Poly, enforce_type
+
+"""
+This module stores polynomials in a compact binary format, so that
+you can cache big expansions between jobs without re-running the
+Python code that built them.
+
+    with open("p.poly", "wb") as f:
+        dump(p, f)
+
+    with PolyFile("p.poly") as pf:
+        assert pf.eval(x=3, y=4) == p.eval(x=3, y=4)
+        assert pf.to_poly() == p
+
+PolyFile memory-maps the file and decodes terms as you iterate over
+them, so you can evaluate or scan a polynomial with millions of terms
+without ever building its _Term objects.
+
+The format (version 1) is:
+
+    b"POLY"                  magic
+    1 byte                   version
+    1 byte                   ring: b"I" (IntegerMath), b"F" (FractionMath),
+                             or b"M" (ModulusMath) followed by the modulus
+    varint                   number of variables
+    per variable:            varint length, then the UTF-8 name
+    varint                   number of terms
+    per term:                one varint exponent per variable, then the
+                             coefficient: a zigzag varint for integers, a
+                             zigzag numerator and varint denominator for
+                             fractions, or a varint for modular values
+
+Variables are sorted, and terms are stored in canonical order.
+
+Varints are the usual little-endian base-128 encoding, and zigzag
+encoding maps 0, -1, 1, -2, ... to 0, 1, 2, 3, ... so that small
+negative numbers stay small.
+"""
+
+MAGIC = b"POLY"
+VERSION = 1
+
+
+def read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def read_zigzag(data, pos):
+    n, pos = read_varint(data, pos)
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def write_varint(out, n):
+    assert n >= 0
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def write_zigzag(out, n):
+    write_varint(out, 2 * n if n >= 0 else -2 * n - 1)
+
+
+def ring_header(Math):
+    """
+    This describes a Math handler (the ring of a Poly), since we
+    only know how to encode the coefficients of the handlers that
+    ship with the library.
+    """
+    if Math is integer_math.IntegerMath:
+        return b"I"
+    if Math is fraction_math.FractionMath:
+        return b"F"
+    if type(Math) == modulus_math.ModulusMath:
+        out = bytearray(b"M")
+        write_varint(out, Math.modulus)
+        return bytes(out)
+    raise ValueError("We can only serialize IntegerMath, FractionMath, or ModulusMath.")
+
+
+def dumps(p):
+    enforce_type(p, Poly)
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    ring = ring_header(p.ring)
+    out += ring
+
+    var_names = sorted(p.variables())
+    write_varint(out, len(var_names))
+    for var_name in var_names:
+        encoded = var_name.encode("utf-8")
+        write_varint(out, len(encoded))
+        out += encoded
+
+    var_index = {var_name: i for i, var_name in enumerate(var_names)}
+    write_varint(out, len(p.terms))
+    for term in p.terms:
+        exponents = [0] * len(var_names)
+        for var_name, exponent in term.key:
+            exponents[var_index[var_name]] = exponent
+        for exponent in exponents:
+            write_varint(out, exponent)
+
+        c = term.coeff
+        if ring == b"I":
+            write_zigzag(out, c)
+        elif ring == b"F":
+            write_zigzag(out, c.numerator)
+            write_varint(out, c.denominator)
+        else:
+            write_varint(out, c)
+    return bytes(out)
+
+
+def dump(p, f):
+    f.write(dumps(p))
+
+
+def loads(data):
+    return PolyData(data).to_poly()
+
+
+def load(f):
+    return loads(f.read())
+
+
+class PolyData:
+    """
+    This reads the format from anything that supports indexing by
+    byte, such as bytes, a memoryview, or an mmap.  We parse the
+    header right away, but we only decode terms on demand.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        if bytes(data[:4]) != MAGIC:
+            raise ValueError("This is not a serialized polynomial.")
+        if data[4] != VERSION:
+            raise ValueError(f"We do not support version {data[4]}.")
+
+        pos = 5
+        kind = bytes(data[pos : pos + 1])
+        pos += 1
+        """
+        We always load and evaluate in the ring that the data was
+        written with, no matter what set_math says.
+        """
+        if kind == b"I":
+            self.handler = integer_math.IntegerMath
+        elif kind == b"F":
+            self.handler = fraction_math.FractionMath
+        elif kind == b"M":
+            modulus, pos = read_varint(data, pos)
+            self.handler = modulus_math.ModulusMath(modulus)
+        else:
+            raise ValueError(f"Unknown ring {kind}")
+        self.ring = bytes(data[5:pos])
+
+        num_vars, pos = read_varint(data, pos)
+        var_names = []
+        for _ in range(num_vars):
+            length, pos = read_varint(data, pos)
+            var_names.append(bytes(data[pos : pos + length]).decode("utf-8"))
+            pos += length
+        self.var_names = var_names
+
+        self.num_terms, pos = read_varint(data, pos)
+        self.terms_start = pos
+
+    def eval(self, **var_assignments):
+        """
+        This is like Poly.eval, but we decode the terms one at a
+        time.  We remember the powers of each variable as we go.
+        """
+        Math = self.handler
+        poly.enforce_dict_types(var_assignments, str, Math.value_type)
+        for var_name in self.var_names:
+            if var_name not in var_assignments:
+                raise ValueError(f"The var {var_name} was not supplied.")
+
+        values = [var_assignments[var_name] for var_name in self.var_names]
+        powers = [{} for _ in self.var_names]
+        result = Math.zero
+        for exponents, coeff in self.iter_terms():
+            product = Math.one
+            for i, exponent in enumerate(exponents):
+                if exponent == 0:
+                    continue
+                power = powers[i].get(exponent)
+                if power is None:
+                    power = Math.power(values[i], exponent)
+                    powers[i][exponent] = power
+                product = Math.mul(product, power)
+            result = Math.add(result, Math.mul(coeff, product))
+        return result
+
+    def iter_terms(self):
+        """
+        This yields (exponents, coeff) pairs, where exponents lines
+        up with self.var_names, in canonical order.
+        """
+        data = self.data
+        num_vars = len(self.var_names)
+        kind = self.ring[:1]
+        pos = self.terms_start
+        for _ in range(self.num_terms):
+            exponents = []
+            for _ in range(num_vars):
+                exponent, pos = read_varint(data, pos)
+                exponents.append(exponent)
+
+            if kind == b"I":
+                coeff, pos = read_zigzag(data, pos)
+            elif kind == b"F":
+                numerator, pos = read_zigzag(data, pos)
+                denominator, pos = read_varint(data, pos)
+                coeff = Fraction(numerator, denominator)
+            else:
+                coeff, pos = read_varint(data, pos)
+            yield tuple(exponents), coeff
+
+    def to_poly(self):
+        var_names = self.var_names
+        coeffs_by_key = {}
+        for exponents, coeff in self.iter_terms():
+            key = tuple(
+                (var_name, exponent)
+                for var_name, exponent in zip(var_names, exponents)
+                if exponent
+            )
+            coeffs_by_key[key] = coeff
+        with poly.using_math(self.handler):
+            return Poly.from_key_dict(coeffs_by_key)
+
+
+class PolyFile(PolyData):
+    """
+    This memory-maps a file that was written by dump, so we only
+    read the parts of the file that we actually look at.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        PolyData.__init__(self, memoryview(self.mmap))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.data.release()
+        self.mmap.close()
+        self.file.close()